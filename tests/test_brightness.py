@@ -0,0 +1,160 @@
+"""Tests for the libddcutil brightness path, against a stubbed library."""
+
+import asyncio
+import time
+
+import pytest
+
+from wlddc.backends.brightness import BrightnessController
+from wlddc.backends.libddcutil import LibDDCUtil
+
+
+class _StubFunc:
+    """Stands in for a ctypes function pointer (argtypes/restype settable)."""
+
+    def __init__(self, impl):
+        self._impl = impl
+
+    def __call__(self, *args):
+        return self._impl(*args)
+
+
+class _StubCDLL:
+    """Records the VCP feature codes libddcutil is asked for."""
+
+    def __init__(
+        self,
+        current: int = 50,
+        maximum: int = 100,
+        rc: int = 0,
+        get_delay: float = 0.0,
+        open_delay: float = 0.0,
+    ):
+        self.get_codes: list[int] = []
+        self.set_calls: list[tuple[int, int, int]] = []
+        self.opened = 0
+        self.closed: list[int] = []
+        self.get_delay = get_delay
+
+        def out(ref, value):
+            ref._obj.value = value
+            return 0
+
+        def open_display(dref, wait, ref):
+            time.sleep(open_delay)
+            self.opened += 1
+            return out(ref, 2 + self.opened)
+
+        def close_display(handle):
+            self.closed.append(handle)
+            return 0
+
+        def get_vcp(handle, code, ref):
+            time.sleep(self.get_delay)
+            self.get_codes.append(code)
+            ref._obj.mh, ref._obj.ml = maximum >> 8, maximum & 0xFF
+            ref._obj.sh, ref._obj.sl = current >> 8, current & 0xFF
+            return rc
+
+        def set_vcp(handle, code, hi, lo):
+            self.set_calls.append((code, hi, lo))
+            return 0
+
+        self.ddca_init = _StubFunc(lambda *args: 0)
+        self.ddca_rc_name = _StubFunc(lambda rc: b"stub")
+        self.ddca_create_busno_display_identifier = _StubFunc(lambda bus, ref: out(ref, 1))
+        self.ddca_free_display_identifier = _StubFunc(lambda did: 0)
+        self.ddca_get_display_ref = _StubFunc(lambda did, ref: out(ref, 2))
+        self.ddca_open_display2 = _StubFunc(open_display)
+        self.ddca_close_display = _StubFunc(close_display)
+        self.ddca_get_non_table_vcp_value = _StubFunc(get_vcp)
+        self.ddca_set_non_table_vcp_value = _StubFunc(set_vcp)
+        self.ddca_get_display_info_list2 = _StubFunc(lambda *args: 0)
+        self.ddca_free_display_info_list = _StubFunc(lambda *args: None)
+
+
+def _controller(cdll: _StubCDLL, **kwargs) -> BrightnessController:
+    controller = BrightnessController(debounce_ms=0, cache_ttl=0, **kwargs)
+    controller._lib = LibDDCUtil(cdll)
+    return controller
+
+
+@pytest.mark.asyncio
+async def test_library_reads_brightness_feature():
+    cdll = _StubCDLL(current=42, maximum=80)
+    controller = _controller(cdll)
+
+    assert await controller.get_brightness(7) == 42
+    assert await controller.get_brightness_range(7) == (0, 80)
+    assert cdll.get_codes == [0x10, 0x10]
+    await controller.aclose()
+
+
+@pytest.mark.asyncio
+async def test_library_writes_brightness_feature():
+    cdll = _StubCDLL()
+    controller = _controller(cdll)
+
+    assert await controller.set_brightness(7, 65)
+    assert cdll.set_calls == [(0x10, 0, 65)]
+    await controller.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failing_bus_backs_off_to_cli():
+    cdll = _StubCDLL(rc=-3001)
+    controller = _controller(cdll, retries=0)
+
+    async def cli_get_brightness(i2c_bus):
+        return 30
+
+    controller._cli_get_brightness = cli_get_brightness
+
+    for _ in range(5):
+        assert await controller.get_brightness(7) == 30
+    # Three failed library reads, then the bus stays on the CLI
+    assert len(cdll.get_codes) == 3
+    assert cdll.opened == 3
+    await controller.aclose()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_call_keeps_cli_off_the_bus():
+    cdll = _StubCDLL(get_delay=0.3)
+    controller = _controller(cdll, command_timeout=0.1)
+    cli_calls = []
+
+    async def cli_get_brightness(i2c_bus):
+        cli_calls.append(i2c_bus)
+        return 30
+
+    controller._cli_get_brightness = cli_get_brightness
+
+    assert await controller.get_brightness(7) is None
+    assert await controller.get_brightness(7) is None
+    assert cli_calls == []
+
+    # Once the stuck read returns, its handle is closed and the bus is usable
+    await asyncio.sleep(0.4)
+    assert cdll.closed == [3]
+    cdll.get_delay = 0.0
+    assert await controller.get_brightness(7) == 50
+    await controller.aclose()
+
+
+@pytest.mark.asyncio
+async def test_late_open_handle_is_closed():
+    cdll = _StubCDLL(open_delay=0.3)
+    controller = _controller(cdll, command_timeout=0.1)
+
+    async def cli_get_brightness(i2c_bus):
+        return 30
+
+    controller._cli_get_brightness = cli_get_brightness
+
+    assert await controller.get_brightness(7) is None
+    await asyncio.sleep(0.4)
+    assert cdll.opened == 1
+    assert cdll.closed == [3]
+    assert controller._handles == {}
+    await controller.aclose()
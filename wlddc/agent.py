@@ -1,50 +1,171 @@
 """Main MQTT agent for Wayland monitor control."""
 
 import asyncio
-import json
+import hashlib
 import logging
 import random
 import signal
-from typing import Optional
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
 import aiomqtt
 
-from wlddc import __version__
+from wlddc import __version__, cache
 from wlddc.backends.brightness import BrightnessController
-from wlddc.backends.display import CorrelatedDisplay, DisplayManager
+from wlddc.backends.display import CorrelatedDisplay, DisplayManager, WaylandOutput
 from wlddc.config import Settings
 
+try:
+    import orjson
+
+    def _dumps(obj: dict) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    import json
+
+    def _dumps(obj: dict) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Accepted "on" payloads for the power switch (case-insensitive "ON")
+_ON_PAYLOADS = frozenset((b"ON", b"On", b"oN", b"on"))
+
+
+@dataclass(frozen=True, slots=True)
+class _TopicSet:
+    """Precomputed MQTT topics and discovery payloads for one display."""
+
+    power_state: str
+    power_set: str
+    brightness_state: str
+    brightness_set: str
+    resolution_state: str
+    power_config: str
+    brightness_config: str
+    resolution_config: str
+    power_discovery_payload: bytes
+    brightness_discovery_payload: Optional[bytes]
+    resolution_discovery_payload: bytes
+
+    def discovery_configs(self) -> list[tuple[str, bytes]]:
+        """(config topic, payload) pairs for the display's entities."""
+        configs = [(self.power_config, self.power_discovery_payload)]
+        if self.brightness_discovery_payload is not None:
+            configs.append((self.brightness_config, self.brightness_discovery_payload))
+        configs.append((self.resolution_config, self.resolution_discovery_payload))
+        return configs
+
 
 class Agent:
     """MQTT agent for controlling Wayland displays."""
 
-    def __init__(self, settings: Settings):
-        """Initialize the agent with settings."""
+    __slots__ = (
+        "settings",
+        "display_manager",
+        "brightness",
+        "displays",
+        "last_power_state",
+        "last_brightness",
+        "last_resolution",
+        "_topic_sets",
+        "_route_table",
+        "_last_full_poll",
+        "_command_since_poll",
+        "_command_tasks",
+        "_session_initialized",
+        "_status_topic",
+        "_discovery_cache_path",
+        "_discovery_hashes",
+        "_client_kwargs",
+        "_client",
+        "_rng",
+        "_shutdown_event",
+    )
+
+    def __init__(self, settings: Settings, force_rediscovery: bool = False):
+        """Initialize the agent with settings.
+
+        Args:
+            settings: Agent configuration
+            force_rediscovery: Republish all discovery configs on the first
+                connection, even if they match what was published last time
+        """
         self.settings = settings
         self.display_manager = DisplayManager(
-            display_overrides=settings.display_overrides
+            display_overrides=settings.display_overrides,
+            use_library=settings.agent.use_libddcutil,
         )
         self.brightness = BrightnessController(
             retries=settings.agent.ddcutil_retries,
             command_timeout=settings.agent.command_timeout,
+            use_library=settings.agent.use_libddcutil,
+            sleep_multiplier=settings.agent.ddcutil_sleep_multiplier,
+            skip_ddc_checks=settings.agent.ddcutil_skip_ddc_checks,
+            dynamic_sleep=settings.agent.ddcutil_dynamic_sleep,
+            debounce_ms=settings.agent.brightness_debounce_ms,
+            cache_ttl=settings.agent.brightness_cache_ttl,
         )
 
         # Display state tracking
         self.displays: dict[str, CorrelatedDisplay] = {}
         self.last_power_state: dict[str, bool] = {}
         self.last_brightness: dict[str, int] = {}
+        self.last_resolution: dict[str, str] = {}
+        self._topic_sets: dict[str, _TopicSet] = {}
+        # Command topic -> (display_id, action), built at subscription time
+        self._route_table: dict[str, tuple[str, str]] = {}
+
+        # Adaptive polling state
+        self._last_full_poll = 0.0
+        self._command_since_poll = False
+
+        # In-flight brightness commands (kept referenced until done)
+        self._command_tasks: set[asyncio.Task[None]] = set()
+
+        # MQTT session state
+        self._session_initialized = False
+        self._status_topic = f"{settings.homeassistant.discovery_prefix}/status"
+
+        # Hashes of the discovery configs last published to this broker
+        self._discovery_cache_path = cache.cache_dir() / "discovery.json"
+        self._discovery_hashes: dict[str, str] = (
+            {} if force_rediscovery else self._load_discovery_hashes()
+        )
+
+        # MQTT connection, built on first connect (it needs a running loop)
+        mqtt = settings.mqtt
+        self._client_kwargs: dict[str, Any] = {
+            "hostname": mqtt.broker,
+            "port": mqtt.port,
+            "username": mqtt.username,
+            "password": mqtt.password.get_secret_value() if mqtt.password else None,
+            "identifier": mqtt.client_id,
+            "keepalive": mqtt.keepalive,
+            # Persistent session: the broker keeps our subscriptions and
+            # queues QoS 1 commands while we're disconnected
+            "clean_session": False,
+        }
+        self._client: Optional[aiomqtt.Client] = None
+        # Dedicated generator for reconnect jitter
+        self._rng = random.Random()
 
         # Shutdown coordination
         self._shutdown_event = asyncio.Event()
-        self._client: Optional[aiomqtt.Client] = None
 
     async def run(self) -> None:
         """Main entry point - run the agent."""
         self._setup_signal_handlers()
 
         try:
+            # Load libddcutil first so it's initialized with our ddcutil options
+            await self.brightness.start()
+
             # Initial display discovery
             await self._discover_displays()
 
@@ -52,11 +173,18 @@ class Agent:
                 logger.error("No displays found. Exiting.")
                 return
 
+            await self.brightness.start(
+                d.ddc.i2c_bus
+                for d in self.displays.values()
+                if d.ddc and d.supports_brightness
+            )
+
             # Run MQTT loop with reconnection
             await self._run_with_reconnect()
         except asyncio.CancelledError:
             logger.info("Agent cancelled")
         finally:
+            await self.brightness.aclose()
             logger.info("Agent shutdown complete")
 
     def _setup_signal_handlers(self) -> None:
@@ -68,7 +196,7 @@ class Agent:
 
     def _handle_shutdown(self, sig: signal.Signals) -> None:
         """Handle shutdown signal."""
-        logger.info(f"Received {sig.name}, initiating graceful shutdown...")
+        logger.info("Received %s, initiating graceful shutdown...", sig.name)
         self._shutdown_event.set()
 
     async def _discover_displays(self) -> None:
@@ -77,15 +205,19 @@ class Agent:
         correlated = await self.display_manager.correlate_displays()
 
         self.displays = {}
+        self._topic_sets = {}
         for display in correlated:
             display_id = display.unique_id
             self.displays[display_id] = display
+            self._topic_sets[display_id] = self._build_topic_set(display_id, display)
             logger.info(
-                f"  {display.display_name}: id={display_id}, "
-                f"brightness={'yes' if display.supports_brightness else 'no'}"
+                "  %s: id=%s, brightness=%s",
+                display.display_name,
+                display_id,
+                "yes" if display.supports_brightness else "no",
             )
 
-        logger.info(f"Discovered {len(self.displays)} display(s)")
+        logger.info("Discovered %d display(s)", len(self.displays))
 
     async def _run_with_reconnect(self) -> None:
         """Run MQTT loop with exponential backoff reconnection."""
@@ -102,24 +234,26 @@ class Agent:
                 if self._shutdown_event.is_set():
                     break
 
-                logger.error(f"MQTT connection error: {e}")
-                logger.info(f"Reconnecting in {reconnect_delay:.1f}s...")
+                # Jitter around the current delay, never beyond max_delay
+                sleep_for = min(reconnect_delay * self._rng.uniform(0.5, 1.5), max_delay)
+
+                logger.error("MQTT connection error: %s", e)
+                logger.info("Reconnecting in %.1fs...", sleep_for)
 
                 # Wait with shutdown check
                 try:
                     await asyncio.wait_for(
-                        self._shutdown_event.wait(), timeout=reconnect_delay
+                        self._shutdown_event.wait(), timeout=sleep_for
                     )
                     break  # Shutdown requested
                 except asyncio.TimeoutError:
                     pass  # Timeout expired, try reconnecting
 
-                # Exponential backoff with jitter
+                # Exponential backoff, capped
                 reconnect_delay = min(reconnect_delay * 2, max_delay)
-                reconnect_delay *= 0.5 + random.random()
 
             except Exception as e:
-                logger.exception(f"Unexpected error: {e}")
+                logger.exception("Unexpected error: %s", e)
                 if not self._shutdown_event.is_set():
                     await asyncio.sleep(reconnect_delay)
 
@@ -127,21 +261,23 @@ class Agent:
         """Connect to MQTT and handle messages."""
         mqtt = self.settings.mqtt
 
-        password = mqtt.password.get_secret_value() if mqtt.password else None
-
-        async with aiomqtt.Client(
-            hostname=mqtt.broker,
-            port=mqtt.port,
-            username=mqtt.username,
-            password=password,
-            identifier=mqtt.client_id,
-            keepalive=mqtt.keepalive,
-        ) as client:
-            self._client = client
-            logger.info(f"Connected to MQTT broker {mqtt.broker}:{mqtt.port}")
-
-            # Publish discovery and subscribe
-            await self._publish_discovery(client)
+        # aiomqtt clients are reusable, so build one and reconnect with it
+        if self._client is None:
+            self._client = aiomqtt.Client(**self._client_kwargs)
+        client = self._client
+
+        async with client:
+            logger.info("Connected to MQTT broker %s:%d", mqtt.broker, mqtt.port)
+
+            # Discovery configs are retained by the broker, so publish them
+            # once per process. If the broker loses them, HA's birth message
+            # on the status topic triggers a republish.
+            if not self._session_initialized:
+                await self._publish_discovery(client)
+                self._session_initialized = True
+
+            # Always resubscribe: aiomqtt doesn't expose the CONNACK
+            # session-present flag, and resubscribing is idempotent.
             await self._subscribe_to_commands(client)
 
             # Initial state publish
@@ -153,90 +289,158 @@ class Agent:
                 self._polling_loop(client),
             )
 
-    async def _publish_discovery(self, client: aiomqtt.Client) -> None:
-        """Publish Home Assistant MQTT discovery configs for all displays."""
+    def _build_topic_set(self, display_id: str, display: CorrelatedDisplay) -> _TopicSet:
+        """Build topics and serialized discovery configs for a display."""
         ha = self.settings.homeassistant
+        prefix = ha.discovery_prefix
+        device_id = ha.device_id
+        name_prefix = display.wayland.model or display.wayland.name
 
         # Shared device info
         device_info = {
-            "identifiers": [ha.device_id],
+            "identifiers": [device_id],
             "name": ha.device_name,
             "model": "Wayland Monitor Controller",
             "manufacturer": "wlddc",
             "sw_version": __version__,
         }
 
-        for display_id, display in self.displays.items():
-            name_prefix = display.wayland.model or display.wayland.name
+        power_state = f"{prefix}/switch/{device_id}/{display_id}/power/state"
+        power_set = f"{prefix}/switch/{device_id}/{display_id}/power/set"
+        brightness_state = f"{prefix}/number/{device_id}/{display_id}/brightness/state"
+        brightness_set = f"{prefix}/number/{device_id}/{display_id}/brightness/set"
+        resolution_state = f"{prefix}/sensor/{device_id}/{display_id}/resolution/state"
+
+        # Power switch discovery
+        power_config = {
+            "name": f"{name_prefix} Power",
+            "unique_id": f"{device_id}_{display_id}_power",
+            "device": device_info,
+            "state_topic": power_state,
+            "command_topic": power_set,
+            # Commands at QoS 1 are queued for our persistent session
+            "qos": 1,
+            "payload_on": "ON",
+            "payload_off": "OFF",
+            "icon": "mdi:monitor",
+        }
 
-            # Power switch discovery
-            power_config = {
-                "name": f"{name_prefix} Power",
-                "unique_id": f"{ha.device_id}_{display_id}_power",
+        # Brightness number (only if DDC supported)
+        brightness_payload: Optional[bytes] = None
+        if display.supports_brightness:
+            brightness_config = {
+                "name": f"{name_prefix} Brightness",
+                "unique_id": f"{device_id}_{display_id}_brightness",
                 "device": device_info,
-                "state_topic": f"{ha.discovery_prefix}/switch/{ha.device_id}/{display_id}/power/state",
-                "command_topic": f"{ha.discovery_prefix}/switch/{ha.device_id}/{display_id}/power/set",
-                "payload_on": "ON",
-                "payload_off": "OFF",
-                "icon": "mdi:monitor",
+                "state_topic": brightness_state,
+                "command_topic": brightness_set,
+                "qos": 1,
+                "min": 0,
+                "max": 100,
+                "step": 5,
+                "mode": "slider",
+                "unit_of_measurement": "%",
+                "icon": "mdi:brightness-6",
             }
-            await client.publish(
-                f"{ha.discovery_prefix}/switch/{ha.device_id}/{display_id}_power/config",
-                json.dumps(power_config),
-                retain=True,
-            )
-            logger.debug(f"Published power discovery for {display_id}")
-
-            # Brightness number (only if DDC supported)
-            if display.supports_brightness:
-                brightness_config = {
-                    "name": f"{name_prefix} Brightness",
-                    "unique_id": f"{ha.device_id}_{display_id}_brightness",
-                    "device": device_info,
-                    "state_topic": f"{ha.discovery_prefix}/number/{ha.device_id}/{display_id}/brightness/state",
-                    "command_topic": f"{ha.discovery_prefix}/number/{ha.device_id}/{display_id}/brightness/set",
-                    "min": 0,
-                    "max": 100,
-                    "step": 5,
-                    "mode": "slider",
-                    "unit_of_measurement": "%",
-                    "icon": "mdi:brightness-6",
-                }
-                await client.publish(
-                    f"{ha.discovery_prefix}/number/{ha.device_id}/{display_id}_brightness/config",
-                    json.dumps(brightness_config),
-                    retain=True,
-                )
-                logger.debug(f"Published brightness discovery for {display_id}")
+            brightness_payload = _dumps(brightness_config)
+
+        # Resolution sensor
+        resolution_config = {
+            "name": f"{name_prefix} Resolution",
+            "unique_id": f"{device_id}_{display_id}_resolution",
+            "device": device_info,
+            "state_topic": resolution_state,
+            "icon": "mdi:monitor-screenshot",
+        }
 
-            # Resolution sensor
-            resolution_config = {
-                "name": f"{name_prefix} Resolution",
-                "unique_id": f"{ha.device_id}_{display_id}_resolution",
-                "device": device_info,
-                "state_topic": f"{ha.discovery_prefix}/sensor/{ha.device_id}/{display_id}/resolution/state",
-                "icon": "mdi:monitor-screenshot",
-            }
-            await client.publish(
-                f"{ha.discovery_prefix}/sensor/{ha.device_id}/{display_id}_resolution/config",
-                json.dumps(resolution_config),
-                retain=True,
+        return _TopicSet(
+            power_state=power_state,
+            power_set=power_set,
+            brightness_state=brightness_state,
+            brightness_set=brightness_set,
+            resolution_state=resolution_state,
+            power_config=f"{prefix}/switch/{device_id}/{display_id}_power/config",
+            brightness_config=f"{prefix}/number/{device_id}/{display_id}_brightness/config",
+            resolution_config=f"{prefix}/sensor/{device_id}/{display_id}_resolution/config",
+            power_discovery_payload=_dumps(power_config),
+            brightness_discovery_payload=brightness_payload,
+            resolution_discovery_payload=_dumps(resolution_config),
+        )
+
+    def _discovery_cache_key(self) -> dict[str, str]:
+        """Identify the broker/device the discovery hashes belong to."""
+        mqtt = self.settings.mqtt
+        ha = self.settings.homeassistant
+        return {
+            "broker": f"{mqtt.broker}:{mqtt.port}",
+            "discovery_prefix": ha.discovery_prefix,
+            "device_id": ha.device_id,
+        }
+
+    def _load_discovery_hashes(self) -> dict[str, str]:
+        """Load previously published discovery hashes for this broker/device."""
+        data = cache.load_json(self._discovery_cache_path)
+        if not isinstance(data, dict) or not isinstance(data.get("hashes"), dict):
+            return {}
+        if any(data.get(k) != v for k, v in self._discovery_cache_key().items()):
+            return {}
+        return data["hashes"]
+
+    async def _publish_discovery(self, client: aiomqtt.Client, force: bool = False) -> None:
+        """Publish Home Assistant MQTT discovery configs for all displays.
+
+        Configs are retained by the broker, so ones whose content hash matches
+        the last publish are skipped unless force is set.
+        """
+        hashes: dict[str, str] = {}
+        published = 0
+
+        for topics in self._topic_sets.values():
+            for topic, payload in topics.discovery_configs():
+                digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+                hashes[topic] = digest
+                if not force and self._discovery_hashes.get(topic) == digest:
+                    continue
+
+                await client.publish(topic, payload, retain=True)
+                published += 1
+                logger.debug("Published discovery config %s", topic)
+
+        if hashes != self._discovery_hashes:
+            self._discovery_hashes = hashes
+            cache.write_json(
+                self._discovery_cache_path,
+                {**self._discovery_cache_key(), "hashes": hashes},
             )
 
-        logger.info(f"Published MQTT discovery for {len(self.displays)} display(s)")
+        logger.info(
+            "Published MQTT discovery for %d display(s) (%d of %d configs changed)",
+            len(self.displays),
+            published,
+            len(hashes),
+        )
 
     async def _subscribe_to_commands(self, client: aiomqtt.Client) -> None:
         """Subscribe to command topics."""
         ha = self.settings.homeassistant
 
-        # Subscribe to all command topics for our device
+        # Subscribe to all command topics for our device. QoS 1 lets the
+        # broker replay commands sent while we were disconnected.
         await client.subscribe(
-            f"{ha.discovery_prefix}/switch/{ha.device_id}/+/power/set"
+            f"{ha.discovery_prefix}/switch/{ha.device_id}/+/power/set", qos=1
         )
         await client.subscribe(
-            f"{ha.discovery_prefix}/number/{ha.device_id}/+/brightness/set"
+            f"{ha.discovery_prefix}/number/{ha.device_id}/+/brightness/set", qos=1
         )
 
+        # Home Assistant announces "online" here when it (re)starts
+        await client.subscribe(self._status_topic, qos=1)
+
+        self._route_table = {}
+        for display_id, topics in self._topic_sets.items():
+            self._route_table[topics.power_set] = (display_id, "power")
+            self._route_table[topics.brightness_set] = (display_id, "brightness")
+
         logger.debug("Subscribed to command topics")
 
     async def _message_handler(self, client: aiomqtt.Client) -> None:
@@ -248,59 +452,150 @@ class Agent:
             try:
                 await self._process_command(client, message)
             except Exception as e:
-                logger.exception(f"Error processing message: {e}")
+                logger.exception("Error processing message: %s", e)
 
     async def _process_command(
         self, client: aiomqtt.Client, message: aiomqtt.Message
     ) -> None:
         """Process a single MQTT command."""
         topic = str(message.topic)
-        payload = message.payload.decode() if message.payload else ""
-
-        logger.debug(f"Received: {topic} = {payload}")
-
-        # Parse topic to extract display_id and command type
-        # Format: {prefix}/{type}/{device_id}/{display_id}/{entity}/set
-        parts = topic.split("/")
-        if len(parts) < 6 or parts[-1] != "set":
+        # Keep the payload as bytes; only the small values we need are parsed
+        payload = message.payload if isinstance(message.payload, bytes) else b""
+
+        logger.debug("Received: %s = %r", topic, payload)
+
+        if topic == self._status_topic:
+            if payload == b"online":
+                logger.info("Home Assistant came online, republishing discovery")
+                await self._publish_discovery(client, force=True)
+                # Force a full state republish for the new HA instance
+                self.last_power_state.clear()
+                self.last_brightness.clear()
+                self.last_resolution.clear()
+                await self._poll_and_publish_state(client)
             return
 
-        entity_type = parts[1]  # "switch" or "number"
-        display_id = parts[3]
-        entity = parts[4]  # "power" or "brightness"
+        route = self._route_table.get(topic) or self._parse_command_topic(topic)
+        if route is None:
+            return
 
+        display_id, action = route
         if display_id not in self.displays:
-            logger.warning(f"Unknown display: {display_id}")
+            logger.warning("Unknown display: %s", display_id)
             return
 
         display = self.displays[display_id]
+        # Make sure the next adaptive poll re-reads the display over DDC
+        self._command_since_poll = True
 
-        if entity_type == "switch" and entity == "power":
-            on = payload.upper() == "ON"
+        if action == "power":
+            on = payload in _ON_PAYLOADS
             success = await self.display_manager.set_display_power(
                 display.wayland.name, on
             )
             if success:
-                # Publish updated state
-                await asyncio.sleep(0.5)  # Brief delay for state to settle
-                await self._publish_display_state(client, display_id, display)
+                # Publish updated state once wlr-randr reflects the change
+                async def read_enabled() -> Optional[bool]:
+                    outputs_by_name = await self._get_outputs_by_name(refresh=True)
+                    output = outputs_by_name.get(display.wayland.name)
+                    return output.enabled if output else None
+
+                await self._await_state(read_enabled, on)
+                outputs_by_name = await self._get_outputs_by_name()
+                await self._publish_display_state(
+                    client, display_id, display, outputs_by_name
+                )
 
-        elif entity_type == "number" and entity == "brightness":
+        elif action == "brightness":
             if not display.supports_brightness:
-                logger.warning(f"Display {display_id} does not support brightness")
+                logger.warning("Display %s does not support brightness", display_id)
                 return
 
             try:
-                value = int(float(payload))
+                # int()/float() accept ASCII bytes directly
+                value = int(float(payload)) if b"." in payload else int(payload)
             except ValueError:
-                logger.warning(f"Invalid brightness value: {payload}")
+                logger.warning("Invalid brightness value: %r", payload)
                 return
 
-            assert display.ddc is not None
-            success = await self.brightness.set_brightness(display.ddc.i2c_bus, value)
+            # Run the debounced write in the background so a burst of slider
+            # updates can coalesce instead of queueing behind each other
+            task = asyncio.create_task(
+                self._apply_brightness(client, display_id, display, value)
+            )
+            self._command_tasks.add(task)
+            task.add_done_callback(self._command_tasks.discard)
+
+    async def _apply_brightness(
+        self,
+        client: aiomqtt.Client,
+        display_id: str,
+        display: CorrelatedDisplay,
+        value: int,
+    ) -> None:
+        """Write a brightness command and publish the resulting state."""
+        assert display.ddc is not None
+        i2c_bus = display.ddc.i2c_bus
+        try:
+            success = await self.brightness.queue_set_brightness(i2c_bus, value)
+            # None means a newer command for this display superseded this one
             if success:
-                await asyncio.sleep(0.5)
-                await self._publish_display_state(client, display_id, display)
+                expected = max(0, min(100, value))
+                # Read the display itself: the cache only holds what we wrote
+                brightness = await self._await_state(
+                    lambda: self.brightness.get_brightness(i2c_bus, fresh=True), expected
+                )
+                outputs_by_name = await self._get_outputs_by_name()
+                await self._publish_display_state(
+                    client, display_id, display, outputs_by_name, brightness
+                )
+        except Exception as e:
+            logger.exception("Error applying brightness to %s: %s", display_id, e)
+
+    @staticmethod
+    def _parse_command_topic(topic: str) -> Optional[tuple[str, str]]:
+        """Parse a command topic not in the route table into (display_id, action)."""
+        # Format: {prefix}/{type}/{device_id}/{display_id}/{entity}/set
+        parts = topic.split("/")
+        if len(parts) < 6 or parts[-1] != "set":
+            return None
+
+        entity_type = parts[1]  # "switch" or "number"
+        display_id = parts[3]
+        entity = parts[4]  # "power" or "brightness"
+
+        if entity_type == "switch" and entity == "power":
+            return (display_id, "power")
+        if entity_type == "number" and entity == "brightness":
+            return (display_id, "brightness")
+        return None
+
+    async def _await_state(
+        self, getter: Callable[[], Awaitable[T]], expected: T, max_ms: int = 500
+    ) -> Optional[T]:
+        """Poll getter with exponential backoff until it returns expected.
+
+        Starts at 50ms and doubles up to max_ms in total, so displays that
+        apply changes quickly are published quickly while slow ones still
+        get a final read.
+
+        Returns:
+            The last value read, or None if the deadline passed before any read
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_ms / 1000
+        delay = 0.05
+        value: Optional[T] = None
+
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return value
+            await asyncio.sleep(min(delay, remaining))
+            value = await getter()
+            if value == expected:
+                return value
+            delay *= 2
 
     async def _polling_loop(self, client: aiomqtt.Client) -> None:
         """Periodically poll and publish display state."""
@@ -314,58 +609,124 @@ class Agent:
             except asyncio.TimeoutError:
                 pass  # Poll interval elapsed
 
-            await self._poll_and_publish_state(client)
+            await self._poll_and_publish_state(client, read_brightness=self._needs_full_poll())
 
-    async def _poll_and_publish_state(self, client: aiomqtt.Client) -> None:
-        """Poll current state and publish to MQTT."""
-        for display_id, display in self.displays.items():
-            await self._publish_display_state(client, display_id, display)
+    def _needs_full_poll(self) -> bool:
+        """Whether the next poll should read brightness over DDC.
+
+        With adaptive polling, ddcutil is only queried after a command was
+        processed or once max_stale_interval has passed; polls in between
+        only refresh the cheap wlr-randr state.
+        """
+        agent = self.settings.agent
+        if not agent.adaptive_polling or self._command_since_poll:
+            return True
+        return time.monotonic() - self._last_full_poll >= agent.max_stale_interval
+
+    async def _get_outputs_by_name(self, refresh: bool = False) -> dict[str, WaylandOutput]:
+        """Get Wayland outputs keyed by name (cached briefly by the display manager)."""
+        outputs = await self.display_manager.discover_wayland_outputs(refresh)
+        return {output.name: output for output in outputs}
+
+    async def _poll_and_publish_state(
+        self, client: aiomqtt.Client, read_brightness: bool = True
+    ) -> None:
+        """Poll current state and publish to MQTT.
+
+        Args:
+            client: Connected MQTT client
+            read_brightness: Query brightness over DDC, not just wlr-randr state
+        """
+        if read_brightness:
+            self._last_full_poll = time.monotonic()
+            self._command_since_poll = False
+
+        buses = (
+            [d.ddc.i2c_bus for d in self.displays.values() if d.supports_brightness and d.ddc]
+            if read_brightness
+            else []
+        )
+        # wlr-randr and the DDC reads are independent, so run them together
+        outputs_by_name, brightness_by_bus = await asyncio.gather(
+            self._get_outputs_by_name(), self.brightness.get_brightness_batch(buses)
+        )
+        await asyncio.gather(
+            *(
+                self._publish_display_state(
+                    client,
+                    display_id,
+                    display,
+                    outputs_by_name,
+                    brightness_by_bus.get(display.ddc.i2c_bus) if display.ddc else None,
+                    read_brightness=False,
+                )
+                for display_id, display in self.displays.items()
+            )
+        )
 
     async def _publish_display_state(
-        self, client: aiomqtt.Client, display_id: str, display: CorrelatedDisplay
+        self,
+        client: aiomqtt.Client,
+        display_id: str,
+        display: CorrelatedDisplay,
+        outputs_by_name: dict[str, WaylandOutput],
+        brightness: Optional[int] = None,
+        read_brightness: bool = True,
     ) -> None:
-        """Publish state for a single display."""
-        ha = self.settings.homeassistant
+        """Publish state for a single display.
+
+        Brightness is read from the display (if read_brightness is set)
+        unless a fresh value is passed in.
+        """
+        topics = self._topic_sets[display_id]
+        output = outputs_by_name.get(display.wayland.name)
+
+        # Collect only changed values, then publish them together
+        pending: list[tuple[str, bytes]] = []
+        changed_power: Optional[bool] = None
+        changed_brightness: Optional[int] = None
+        changed_resolution: Optional[str] = None
 
         # Get power state
-        enabled = await self.display_manager.get_display_enabled(display.wayland.name)
-        if enabled is not None:
-            if (
-                display_id not in self.last_power_state
-                or self.last_power_state[display_id] != enabled
-            ):
-                self.last_power_state[display_id] = enabled
-                state = "ON" if enabled else "OFF"
-                await client.publish(
-                    f"{ha.discovery_prefix}/switch/{ha.device_id}/{display_id}/power/state",
-                    state,
-                    retain=True,
-                )
-                logger.debug(f"Published {display_id} power: {state}")
+        if output is not None and self.last_power_state.get(display_id) != output.enabled:
+            changed_power = output.enabled
+            pending.append((topics.power_state, b"ON" if changed_power else b"OFF"))
 
         # Get brightness (if supported)
         if display.supports_brightness and display.ddc:
-            brightness = await self.brightness.get_brightness(display.ddc.i2c_bus)
-            if brightness is not None:
-                if (
-                    display_id not in self.last_brightness
-                    or self.last_brightness[display_id] != brightness
-                ):
-                    self.last_brightness[display_id] = brightness
-                    await client.publish(
-                        f"{ha.discovery_prefix}/number/{ha.device_id}/{display_id}/brightness/state",
-                        str(brightness),
-                        retain=True,
-                    )
-                    logger.debug(f"Published {display_id} brightness: {brightness}")
-
-        # Publish resolution
-        outputs = await self.display_manager.discover_wayland_outputs()
-        for output in outputs:
-            if output.name == display.wayland.name and output.current_mode:
-                await client.publish(
-                    f"{ha.discovery_prefix}/sensor/{ha.device_id}/{display_id}/resolution/state",
-                    output.current_mode,
-                    retain=True,
-                )
-                break
+            if brightness is None and read_brightness:
+                brightness = await self.brightness.get_brightness(display.ddc.i2c_bus)
+            if brightness is not None and self.last_brightness.get(display_id) != brightness:
+                changed_brightness = brightness
+                pending.append((topics.brightness_state, str(brightness).encode()))
+
+        # Get resolution
+        if (
+            output is not None
+            and output.current_mode
+            and self.last_resolution.get(display_id) != output.current_mode
+        ):
+            changed_resolution = output.current_mode
+            pending.append((topics.resolution_state, changed_resolution.encode()))
+
+        if not pending:
+            return
+
+        await asyncio.gather(
+            *(client.publish(topic, payload, retain=True) for topic, payload in pending)
+        )
+
+        # Record state only once it's actually been published
+        if changed_power is not None:
+            self.last_power_state[display_id] = changed_power
+        if changed_brightness is not None:
+            self.last_brightness[display_id] = changed_brightness
+        if changed_resolution is not None:
+            self.last_resolution[display_id] = changed_resolution
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Published %s state: %s",
+                display_id,
+                ", ".join(f"{topic}={payload.decode()}" for topic, payload in pending),
+            )
@@ -2,96 +2,502 @@
 
 import asyncio
 import logging
-from typing import Optional
+import re
+import shutil
+import time
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+from wlddc.backends.libddcutil import DDCAError, LibDDCUtil, load_libddcutil
 
 logger = logging.getLogger(__name__)
 
-# DDC/CI VCP code for brightness (decimal 10, aka 0x0A)
+T = TypeVar("T")
+
+# DDC/CI VCP feature code for brightness is 0x10. ddcutil parses feature
+# codes on its command line as hex, so the CLI is passed "10".
 VCP_BRIGHTNESS = 10
+_VCP_BRIGHTNESS_CODE = 0x10
 
+# getvcp --brief output: "VCP 10 C <current> <max>" (max is missing on
+# some monitors)
+_VCP10_RE = re.compile(rb"^VCP 10 C (\d+)(?: (\d+))?")
+
+_ddcutil_path: Optional[str] = None
+
+# After this many libddcutil failures in a row on a bus, use the CLI for it
+# for _LIB_BACKOFF seconds instead of reopening the display on every call
+_LIB_MAX_FAILURES = 3
+_LIB_BACKOFF = 300.0
+
+
+async def _spawn_ddcutil(*args: str, close_fds: bool = False) -> asyncio.subprocess.Process:
+    """Start ddcutil with piped stdout/stderr.
+
+    On the default asyncio loop, subprocess only uses posix_spawn()
+    (vfork-style, no copy of the whole interpreter) when given an absolute
+    executable path and close_fds=False. Under uvloop, libuv spawns the
+    child itself and this makes no difference.
+
+    Descriptors Python opens are non-inheritable, but ones opened by C
+    code (such as libddcutil's /dev/i2c-* handles) may not be, so callers
+    pass close_fds=True once the library is loaded.
+
+    Args:
+        args: ddcutil arguments
+        close_fds: Close inherited descriptors in the child
+
+    Raises:
+        FileNotFoundError if ddcutil isn't on PATH
+    """
+    global _ddcutil_path
+    if _ddcutil_path is None:
+        _ddcutil_path = shutil.which("ddcutil")
+        if _ddcutil_path is None:
+            raise FileNotFoundError("ddcutil")
+
+    return await asyncio.create_subprocess_exec(
+        _ddcutil_path,
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        close_fds=close_fds,
+    )
+
+
+async def _read_brief_line(proc: asyncio.subprocess.Process) -> tuple[bytes, bytes]:
+    """Read the single line ddcutil --brief prints, then let it exit.
+
+    Returns:
+        Tuple of (first stdout line, stderr)
+    """
+    assert proc.stdout is not None
+    line = await proc.stdout.readline()
+    _, stderr = await proc.communicate()
+    return line, stderr
 
-class BrightnessController:
-    """Control monitor brightness via ddcutil."""
 
-    def __init__(self, retries: int = 2, command_timeout: float = 10.0):
+class BrightnessController:
+    """Control monitor brightness via libddcutil or the ddcutil CLI.
+
+    After start(), VCP reads and writes go through libddcutil in-process
+    using one display handle per I2C bus. Without start(), or if the
+    library can't be loaded, every operation runs the ddcutil binary.
+    """
+
+    def __init__(
+        self,
+        retries: int = 2,
+        command_timeout: float = 10.0,
+        use_library: bool = True,
+        sleep_multiplier: float = 0.1,
+        skip_ddc_checks: bool = True,
+        dynamic_sleep: Optional[bool] = None,
+        debounce_ms: int = 200,
+        cache_ttl: float = 5.0,
+    ):
         """Initialize brightness controller.
 
         Args:
             retries: Number of retries for ddcutil commands
-            command_timeout: Timeout for ddcutil commands in seconds
+            command_timeout: Time budget for one ddcutil operation in
+                seconds, shared by its retries
+            use_library: Try libddcutil before falling back to the CLI
+            sleep_multiplier: Scale factor for ddcutil's DDC/CI wait times
+            skip_ddc_checks: Skip ddcutil's DDC/CI capability check per call
+            dynamic_sleep: Enable/disable ddcutil's dynamic sleep adjustment,
+                or None to keep ddcutil's default
+            debounce_ms: How long queue_set_brightness() waits for a newer
+                value before writing
+            cache_ttl: Seconds a read or written brightness value is reused
+                by get_brightness() before the display is queried again
         """
         self.retries = retries
         self.command_timeout = command_timeout
+        self.use_library = use_library
+        self.sleep_multiplier = sleep_multiplier
+        self.skip_ddc_checks = skip_ddc_checks
+        self.dynamic_sleep = dynamic_sleep
+        self.debounce_ms = debounce_ms
+        self.cache_ttl = cache_ttl
+
+        # Last known brightness per bus: (time.monotonic() timestamp, value)
+        self._cache: dict[int, tuple[float, int]] = {}
+        self._bus_locks: dict[int, asyncio.Lock] = {}
+
+        # Write coalescing state for queue_set_brightness(), keyed by bus
+        self._pending: dict[int, int] = {}
+        self._waiters: dict[int, asyncio.Future[Optional[bool]]] = {}
+        self._writer_tasks: dict[int, asyncio.Task[None]] = {}
+
+        # Options shared by every ddcutil invocation. The bus is always
+        # given explicitly, so ddcutil never has to run display detection.
+        options = ["--sleep-multiplier", str(sleep_multiplier)]
+        if dynamic_sleep is not None:
+            options.append("--enable-dynamic-sleep" if dynamic_sleep else "--disable-dynamic-sleep")
+        self._lib_options = " ".join(options)
+        if skip_ddc_checks:
+            options.append("--skip-ddc-checks")
+        self._ddcutil_options = tuple(options)
+        self._lib: Optional[LibDDCUtil] = None
+        self._handles: dict[int, int] = {}
+        # Consecutive libddcutil failures per bus, and until when (monotonic
+        # time) a bus that kept failing goes straight to the CLI
+        self._lib_failures: dict[int, int] = {}
+        self._cli_until: dict[int, float] = {}
+        # Library calls that timed out but are still running in their thread
+        self._stuck_calls: dict[int, asyncio.Future[Any]] = {}
+
+    async def start(self, i2c_buses: Iterable[int] = ()) -> None:
+        """Load libddcutil and open handles for the given buses.
+
+        Buses not listed here are opened on first use. May be called again
+        to open more buses.
+
+        Args:
+            i2c_buses: I2C bus numbers of the displays that will be controlled
+        """
+        if not self.use_library:
+            return
+
+        if self._lib is None:
+            self._lib = await asyncio.to_thread(load_libddcutil, self._lib_options)
+            if self._lib is None:
+                return
+
+        for i2c_bus in i2c_buses:
+            await self._get_handle(i2c_bus)
+
+    async def aclose(self) -> None:
+        """Drop queued writes and close all open libddcutil display handles."""
+        for task in list(self._writer_tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._writer_tasks.values(), return_exceptions=True)
+        for waiter in self._waiters.values():
+            if not waiter.done():
+                waiter.set_result(None)
+        self._pending.clear()
+        self._waiters.clear()
+        self._writer_tasks.clear()
+
+        lib, handles = self._lib, self._handles
+        self._handles = {}
+        if lib is None:
+            return
+
+        for i2c_bus, handle in handles.items():
+            await asyncio.to_thread(self._close_handle, i2c_bus, handle)
+
+    def _close_handle(self, i2c_bus: int, handle: int) -> None:
+        """Close a libddcutil display handle (blocking), logging failures."""
+        assert self._lib is not None
+        try:
+            self._lib.close(handle)
+        except DDCAError as e:
+            logger.debug(f"Failed to close display on bus {i2c_bus}: {e}")
+
+    async def _in_thread(
+        self, i2c_bus: int, timeout: float, func: Callable[..., T], *args: Any
+    ) -> T:
+        """Run a blocking libddcutil call in a worker thread, with a timeout.
+
+        The thread of a call that times out can't be stopped, so the call is
+        remembered in _stuck_calls until it finishes; see _bus_stuck().
+
+        Raises:
+            asyncio.TimeoutError, or whatever func raises
+        """
+        future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._stuck_calls[i2c_bus] = future
+            future.add_done_callback(lambda f: self._stuck_call_done(i2c_bus, f))
+            raise
+
+    def _stuck_call_done(self, i2c_bus: int, future: asyncio.Future[Any]) -> None:
+        """Forget a timed out call once its thread finally returns."""
+        if self._stuck_calls.get(i2c_bus) is future:
+            del self._stuck_calls[i2c_bus]
+        if not future.cancelled() and future.exception() is not None:
+            logger.debug(f"Timed out libddcutil call on bus {i2c_bus} failed: {future.exception()}")
+
+    def _bus_stuck(self, i2c_bus: int) -> bool:
+        """Whether a timed out libddcutil call is still using the bus.
+
+        ddcutil traffic on the bus would interleave with it, so callers
+        fail fast instead of falling back to the CLI.
+        """
+        if i2c_bus not in self._stuck_calls:
+            return False
+        logger.warning(f"Bus {i2c_bus} is still busy with a timed out libddcutil call")
+        return True
+
+    async def _get_handle(self, i2c_bus: int) -> Optional[int]:
+        """Return the libddcutil handle for a bus, opening it if needed.
+
+        Returns:
+            Display handle, or None if the library isn't in use or the
+            display can't be opened (the caller should use the CLI, unless
+            _bus_stuck() says a timed out call still holds the bus)
+        """
+        if (
+            self._lib is None
+            or i2c_bus in self._stuck_calls
+            or time.monotonic() < self._cli_until.get(i2c_bus, 0.0)
+        ):
+            return None
+
+        handle = self._handles.get(i2c_bus)
+        if handle is None:
+            try:
+                handle = await self._in_thread(
+                    i2c_bus, self.command_timeout, self._lib.open_bus, i2c_bus
+                )
+            except (DDCAError, asyncio.TimeoutError) as e:
+                logger.warning(f"libddcutil can't open bus {i2c_bus}, using ddcutil CLI: {e!r}")
+                self._note_lib_failure(i2c_bus)
+                stuck = self._stuck_calls.get(i2c_bus)
+                if stuck is not None:
+                    # Nobody will use a handle the open returns late
+                    stuck.add_done_callback(lambda f: self._close_after(i2c_bus, f))
+                return None
+            self._handles[i2c_bus] = handle
+        return handle
+
+    def _close_after(
+        self, i2c_bus: int, future: asyncio.Future[Any], handle: Optional[int] = None
+    ) -> None:
+        """Close a handle once the timed out call using it has finished.
+
+        Args:
+            i2c_bus: The I2C bus number of the call
+            future: The finished call
+            handle: Handle to close, or None to close the handle the call
+                (an open_bus()) returned
+        """
+        if handle is None:
+            if future.cancelled() or future.exception() is not None:
+                return
+            handle = future.result()
+        asyncio.get_running_loop().run_in_executor(None, self._close_handle, i2c_bus, handle)
+
+    def _note_lib_failure(self, i2c_bus: int) -> None:
+        """Count a libddcutil failure, backing off to the CLI if it keeps failing."""
+        failures = self._lib_failures.get(i2c_bus, 0) + 1
+        if failures < _LIB_MAX_FAILURES:
+            self._lib_failures[i2c_bus] = failures
+            return
+
+        logger.warning(
+            f"libddcutil failed {failures} times in a row on bus {i2c_bus}, "
+            f"using ddcutil CLI for {_LIB_BACKOFF:.0f}s"
+        )
+        self._lib_failures.pop(i2c_bus, None)
+        self._cli_until[i2c_bus] = time.monotonic() + _LIB_BACKOFF
+
+    async def _drop_handle(self, i2c_bus: int, error: Exception) -> None:
+        """Forget a bus's handle after a failed call so the next call reopens it.
+
+        A monitor that was power-cycled or replugged leaves a stale handle
+        behind that fails every call. A handle whose call timed out is only
+        closed once the stuck thread is done with it.
 
-    async def get_brightness(self, i2c_bus: int) -> Optional[int]:
+        Args:
+            i2c_bus: The I2C bus number whose call failed
+            error: The DDCAError or asyncio.TimeoutError the call raised
+        """
+        logger.warning(f"libddcutil call failed on bus {i2c_bus}: {error!r}")
+        self._note_lib_failure(i2c_bus)
+        handle = self._handles.pop(i2c_bus, None)
+        if handle is None or self._lib is None:
+            return
+
+        stuck = self._stuck_calls.get(i2c_bus)
+        if stuck is not None:
+            stuck.add_done_callback(lambda f: self._close_after(i2c_bus, f, handle))
+            return
+        await asyncio.to_thread(self._close_handle, i2c_bus, handle)
+
+    async def _lib_call(self, i2c_bus: int, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking libddcutil call in a thread, with retries.
+
+        Like _run_ddcutil(), all attempts share one command_timeout budget.
+        A timed out call isn't retried, since its thread can't be stopped
+        and may still be using the display.
+
+        Raises:
+            DDCAError or asyncio.TimeoutError if the last attempt fails
+        """
+        deadline = time.monotonic() + self.command_timeout
+        for attempt in range(self.retries + 1):
+            try:
+                result = await self._in_thread(
+                    i2c_bus, max(0.0, deadline - time.monotonic()), func, *args
+                )
+            except DDCAError as e:
+                remaining = deadline - time.monotonic()
+                if attempt >= self.retries or remaining <= 0.5:
+                    raise
+                logger.debug(f"libddcutil call failed on bus {i2c_bus}, retrying: {e}")
+                await asyncio.sleep(0.5)
+            else:
+                self._lib_failures.pop(i2c_bus, None)
+                return result
+
+    async def get_brightness(self, i2c_bus: int, fresh: bool = False) -> Optional[int]:
         """Get current brightness for a display via its I2C bus.
 
         Args:
             i2c_bus: The I2C bus number (e.g., 7 for /dev/i2c-7)
+            fresh: Always read the display (and refresh the cache), e.g. to
+                verify a write
 
         Returns:
             Brightness value 0-100, or None on failure
         """
-        for attempt in range(self.retries + 1):
+        cached = None if fresh else self._cached_brightness(i2c_bus)
+        if cached is not None:
+            return cached
+
+        async with self._lock(i2c_bus):
+            # Another reader may have refreshed the cache while we waited
+            cached = None if fresh else self._cached_brightness(i2c_bus)
+            if cached is not None:
+                return cached
+
+            value = await self._read_brightness(i2c_bus)
+            if value is None:
+                self._cache.pop(i2c_bus, None)
+            else:
+                self._cache[i2c_bus] = (time.monotonic(), value)
+            return value
+
+    async def get_brightness_batch(self, buses: Iterable[int]) -> dict[int, Optional[int]]:
+        """Get brightness for several displays at once.
+
+        Each bus is read concurrently (buses don't share a lock, and with
+        libddcutil every read reuses the display handle opened in start()).
+
+        Args:
+            buses: I2C bus numbers to read
+
+        Returns:
+            Brightness value 0-100 (or None on failure) per bus
+        """
+        unique = list(dict.fromkeys(buses))
+        results = await asyncio.gather(*(self.get_brightness(bus) for bus in unique))
+        return dict(zip(unique, results))
+
+    def _cached_brightness(self, i2c_bus: int) -> Optional[int]:
+        """Return the cached brightness for a bus if it's still fresh."""
+        cached = self._cache.get(i2c_bus)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+        return None
+
+    def _lock(self, i2c_bus: int) -> asyncio.Lock:
+        """Lock serializing DDC/CI traffic on one I2C bus.
+
+        ddcutil transactions on the same bus aren't reentrant; overlapping
+        reads and writes just fail and retry.
+        """
+        return self._bus_locks.setdefault(i2c_bus, asyncio.Lock())
+
+    async def _read_brightness(self, i2c_bus: int) -> Optional[int]:
+        """Read brightness from the display, bypassing the cache."""
+        handle = await self._get_handle(i2c_bus)
+        if handle is not None:
             try:
-                proc = await asyncio.create_subprocess_exec(
-                    "ddcutil",
-                    "getvcp",
-                    str(VCP_BRIGHTNESS),
-                    "--bus",
-                    str(i2c_bus),
-                    "--brief",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
+                current, _ = await self._lib_call(
+                    i2c_bus, self._lib.get_vcp, handle, _VCP_BRIGHTNESS_CODE
                 )
+                return current
+            except (DDCAError, asyncio.TimeoutError) as e:
+                await self._drop_handle(i2c_bus, e)
+
+        if self._bus_stuck(i2c_bus):
+            return None
+        return await self._cli_get_brightness(i2c_bus)
+
+    async def _cli_get_brightness(self, i2c_bus: int) -> Optional[int]:
+        """get_brightness() by running the ddcutil binary."""
+        result = await self._run_ddcutil(
+            "getvcp", str(VCP_BRIGHTNESS), "--bus", str(i2c_bus), "--brief"
+        )
+        if result is None:
+            return None
+
+        returncode, line, stderr = result
+        if returncode != 0:
+            logger.warning(f"ddcutil getvcp failed on bus {i2c_bus}: {stderr.decode()}")
+            return None
+
+        match = _VCP10_RE.match(line)
+        if match:
+            return int(match.group(1))
+
+        logger.warning(f"Unexpected ddcutil output: {line.decode(errors='replace').strip()}")
+        return None
 
-                try:
-                    stdout, stderr = await asyncio.wait_for(
-                        proc.communicate(), timeout=self.command_timeout
-                    )
-                except asyncio.TimeoutError:
-                    proc.kill()
-                    logger.warning(f"ddcutil getvcp timed out on bus {i2c_bus}")
-                    continue
-
-                if proc.returncode != 0:
-                    if attempt < self.retries:
-                        logger.debug(f"ddcutil getvcp failed on bus {i2c_bus}, retrying...")
-                        await asyncio.sleep(0.5)
-                        continue
-                    logger.warning(f"ddcutil getvcp failed on bus {i2c_bus}: {stderr.decode()}")
-                    return None
-
-                # Brief format: "VCP 10 C 60 100" (code, type, current, max)
-                # or "VCP 10 C 60" for some monitors
-                output = stdout.decode().strip()
-                parts = output.split()
-
-                if len(parts) >= 4 and parts[0] == "VCP":
-                    return int(parts[3])
-                elif len(parts) >= 3:
-                    # Some formats may differ
-                    for i, part in enumerate(parts):
-                        if part == "C" and i + 1 < len(parts):
-                            return int(parts[i + 1])
-
-                logger.warning(f"Unexpected ddcutil output: {output}")
-                return None
+    async def _run_ddcutil(self, *args: str) -> Optional[tuple[int, bytes, bytes]]:
+        """Run a ddcutil command, retrying failures within command_timeout.
+
+        The timeout is one budget for all attempts, so a monitor that never
+        answers costs command_timeout in total rather than per retry.
 
+        Args:
+            args: ddcutil command and arguments; the shared tuning options
+                are appended
+
+        Returns:
+            Tuple of (exit code, first stdout line, stderr) of the last
+            completed attempt, or None if there was none (ddcutil missing,
+            or out of time before any attempt finished)
+        """
+        command = args[0]
+        deadline = time.monotonic() + self.command_timeout
+        result: Optional[tuple[int, bytes, bytes]] = None
+
+        for attempt in range(self.retries + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            if attempt:
+                logger.debug(f"ddcutil {command} failed, retrying...")
+                await asyncio.sleep(min(0.5, remaining))
+
+            try:
+                proc = await _spawn_ddcutil(
+                    *args, *self._ddcutil_options, close_fds=self._lib is not None
+                )
             except FileNotFoundError:
                 logger.error("ddcutil not found. Is it installed?")
                 return None
-            except ValueError as e:
-                logger.warning(f"Failed to parse brightness value: {e}")
-                return None
             except Exception as e:
-                logger.exception(f"Error getting brightness: {e}")
-                if attempt < self.retries:
-                    await asyncio.sleep(0.5)
-                    continue
-                return None
+                logger.exception(f"Error running ddcutil {command}: {e}")
+                result = None
+                continue
 
-        return None
+            try:
+                line, stderr = await asyncio.wait_for(
+                    _read_brief_line(proc), timeout=max(0.0, deadline - time.monotonic())
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                # Reap the child so it doesn't linger as a zombie
+                await proc.wait()
+                break
+
+            assert proc.returncode is not None
+            result = (proc.returncode, line, stderr)
+            if proc.returncode == 0:
+                return result
+        else:
+            return result
+
+        logger.warning(f"ddcutil {command} timed out after {self.command_timeout}s")
+        return result
 
     async def set_brightness(self, i2c_bus: int, value: int) -> bool:
         """Set brightness for a display via its I2C bus.
@@ -105,51 +511,107 @@ class BrightnessController:
         """
         # Clamp value to valid range
         value = max(0, min(100, value))
+        return await self._do_set(i2c_bus, value)
 
-        for attempt in range(self.retries + 1):
-            try:
-                proc = await asyncio.create_subprocess_exec(
-                    "ddcutil",
-                    "setvcp",
-                    str(VCP_BRIGHTNESS),
-                    str(value),
-                    "--bus",
-                    str(i2c_bus),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
+    async def queue_set_brightness(self, i2c_bus: int, value: int) -> Optional[bool]:
+        """Set brightness, coalescing bursts of writes to the same bus.
 
-                try:
-                    _, stderr = await asyncio.wait_for(
-                        proc.communicate(), timeout=self.command_timeout
-                    )
-                except asyncio.TimeoutError:
-                    proc.kill()
-                    logger.warning(f"ddcutil setvcp timed out on bus {i2c_bus}")
-                    continue
-
-                if proc.returncode != 0:
-                    if attempt < self.retries:
-                        logger.debug(f"ddcutil setvcp failed on bus {i2c_bus}, retrying...")
-                        await asyncio.sleep(0.5)
-                        continue
-                    logger.error(f"ddcutil setvcp failed on bus {i2c_bus}: {stderr.decode()}")
-                    return False
+        The value is held for the debounce window; if another value for the
+        same bus arrives in the meantime, only the latest one is written.
+        This keeps slider drags from flooding the monitor (and its NVRAM)
+        with intermediate values.
 
-                logger.info(f"Set brightness on bus {i2c_bus} to {value}")
-                return True
+        Args:
+            i2c_bus: The I2C bus number
+            value: Brightness value 0-100
 
-            except FileNotFoundError:
-                logger.error("ddcutil not found. Is it installed?")
-                return False
-            except Exception as e:
-                logger.exception(f"Error setting brightness: {e}")
-                if attempt < self.retries:
-                    await asyncio.sleep(0.5)
-                    continue
-                return False
+        Returns:
+            True/False for the outcome of the write, or None if the value
+            was superseded by a newer one before it was written
+        """
+        value = max(0, min(100, value))
+
+        # Only the newest waiter per bus gets the write result
+        previous = self._waiters.get(i2c_bus)
+        if previous is not None and not previous.done():
+            previous.set_result(None)
 
-        return False
+        waiter: asyncio.Future[Optional[bool]] = asyncio.get_running_loop().create_future()
+        self._pending[i2c_bus] = value
+        self._waiters[i2c_bus] = waiter
+
+        if i2c_bus not in self._writer_tasks:
+            self._writer_tasks[i2c_bus] = asyncio.create_task(
+                self._brightness_writer(i2c_bus)
+            )
+
+        return await waiter
+
+    async def _brightness_writer(self, i2c_bus: int) -> None:
+        """Write the latest queued value for a bus once it settles."""
+        try:
+            while i2c_bus in self._pending:
+                await asyncio.sleep(self.debounce_ms / 1000)
+                value = self._pending.pop(i2c_bus)
+                waiter = self._waiters.pop(i2c_bus)
+                success: Optional[bool] = None
+                try:
+                    success = await self._do_set(i2c_bus, value)
+                finally:
+                    if not waiter.done():
+                        waiter.set_result(success)
+        finally:
+            self._writer_tasks.pop(i2c_bus, None)
+
+    async def _do_set(self, i2c_bus: int, value: int) -> bool:
+        """Write an already clamped brightness value to a bus."""
+        async with self._lock(i2c_bus):
+            success = await self._write_brightness(i2c_bus, value)
+            # Write-through: a successful write is the freshest value we can know
+            if success:
+                self._cache[i2c_bus] = (time.monotonic(), value)
+            else:
+                self._cache.pop(i2c_bus, None)
+            return success
+
+    async def _write_brightness(self, i2c_bus: int, value: int) -> bool:
+        """Write brightness to the display via libddcutil or the CLI."""
+        handle = await self._get_handle(i2c_bus)
+        if handle is not None:
+            try:
+                await self._lib_call(
+                    i2c_bus, self._lib.set_vcp, handle, _VCP_BRIGHTNESS_CODE, value
+                )
+                logger.info(f"Set brightness on bus {i2c_bus} to {value}")
+                return True
+            except (DDCAError, asyncio.TimeoutError) as e:
+                await self._drop_handle(i2c_bus, e)
+
+        if self._bus_stuck(i2c_bus):
+            return False
+        return await self._cli_set_brightness(i2c_bus, value)
+
+    async def _cli_set_brightness(self, i2c_bus: int, value: int) -> bool:
+        """set_brightness() by running the ddcutil binary."""
+        result = await self._run_ddcutil(
+            "setvcp",
+            str(VCP_BRIGHTNESS),
+            str(value),
+            "--bus",
+            str(i2c_bus),
+            # The agent reads the value back itself after a write
+            "--noverify",
+        )
+        if result is None:
+            return False
+
+        returncode, _, stderr = result
+        if returncode != 0:
+            logger.error(f"ddcutil setvcp failed on bus {i2c_bus}: {stderr.decode()}")
+            return False
+
+        logger.info(f"Set brightness on bus {i2c_bus} to {value}")
+        return True
 
     async def get_brightness_range(self, i2c_bus: int) -> tuple[int, int]:
         """Get the brightness range for a display.
@@ -159,37 +621,35 @@ class BrightnessController:
         Returns:
             Tuple of (min, max) brightness values, defaults to (0, 100)
         """
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                "ddcutil",
-                "getvcp",
-                str(VCP_BRIGHTNESS),
-                "--bus",
-                str(i2c_bus),
-                "--brief",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
+        async with self._lock(i2c_bus):
+            return await self._read_brightness_range(i2c_bus)
 
+    async def _read_brightness_range(self, i2c_bus: int) -> tuple[int, int]:
+        """get_brightness_range() via libddcutil or the CLI."""
+        handle = await self._get_handle(i2c_bus)
+        if handle is not None:
             try:
-                stdout, _ = await asyncio.wait_for(
-                    proc.communicate(), timeout=self.command_timeout
+                _, max_val = await self._lib_call(
+                    i2c_bus, self._lib.get_vcp, handle, _VCP_BRIGHTNESS_CODE
                 )
-            except asyncio.TimeoutError:
-                proc.kill()
-                return (0, 100)
-
-            if proc.returncode != 0:
-                return (0, 100)
-
-            # Brief format: "VCP 10 C 60 100" - last value is max
-            output = stdout.decode().strip()
-            parts = output.split()
-
-            if len(parts) >= 5 and parts[0] == "VCP":
-                max_val = int(parts[4])
                 return (0, max_val)
+            except (DDCAError, asyncio.TimeoutError) as e:
+                await self._drop_handle(i2c_bus, e)
 
+        if self._bus_stuck(i2c_bus):
             return (0, 100)
-        except Exception:
+        return await self._cli_get_brightness_range(i2c_bus)
+
+    async def _cli_get_brightness_range(self, i2c_bus: int) -> tuple[int, int]:
+        """get_brightness_range() by running the ddcutil binary."""
+        result = await self._run_ddcutil(
+            "getvcp", str(VCP_BRIGHTNESS), "--bus", str(i2c_bus), "--brief"
+        )
+        if result is None or result[0] != 0:
             return (0, 100)
+
+        match = _VCP10_RE.match(result[1])
+        if match and match.group(2):
+            return (0, int(match.group(2)))
+
+        return (0, 100)
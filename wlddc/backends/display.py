@@ -1,15 +1,77 @@
 """Display management via wlr-randr with DDC correlation."""
 
 import asyncio
+import hashlib
 import logging
+import os
 import re
-from dataclasses import dataclass
-from typing import Optional
+import time
+from dataclasses import asdict, astuple, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from wlddc import cache
+from wlddc.backends.libddcutil import DDCAError, load_libddcutil
 
 logger = logging.getLogger(__name__)
 
+DRM_CLASS_PATH = Path("/sys/class/drm")
+BOOT_ID_PATH = Path("/proc/sys/kernel/random/boot_id")
+
+# Bump when the cached DDCDisplay layout changes
+DDC_CACHE_VERSION = 1
+
+# wlr-randr output parsing (on raw stdout bytes)
+_OUTPUT_NAME_RE = re.compile(rb"^(\S+)")
+_MODE_RE = re.compile(rb"(\d+x\d+@[\d.]+)\s*Hz")
+
+# ddcutil detect output parsing (on raw stdout bytes)
+_I2C_RE = re.compile(rb"/dev/i2c-(\d+)")
+_MFG_RE = re.compile(rb"\s*(\w+)")
+
+# Characters replaced with "_" in Home Assistant IDs
+_ID_TRANS = str.maketrans({" ": "_", "-": "_"})
+
+
+def default_cache_path() -> Path:
+    """Default location of the DDC detection cache."""
+    return cache.cache_dir() / "displays.json"
+
+
+def drm_fingerprint() -> Optional[str]:
+    """Fingerprint the connected monitors from sysfs without probing DDC.
+
+    Covers connector status, EDID and the connector's i2c adapter, plus the
+    boot ID so i2c bus renumbering across reboots invalidates the cache.
+    Returns None if DRM information isn't available.
+    """
+    try:
+        connectors = sorted(p for p in DRM_CLASS_PATH.iterdir() if "-" in p.name)
+    except OSError:
+        return None
+
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        digest.update(BOOT_ID_PATH.read_bytes())
+    except OSError:
+        pass
+
+    for connector in connectors:
+        digest.update(connector.name.encode() + b"\0")
+        for attr in ("status", "edid"):
+            try:
+                digest.update((connector / attr).read_bytes() + b"\0")
+            except OSError:
+                pass
+        try:
+            digest.update(os.readlink(connector / "ddc").encode() + b"\0")
+        except OSError:
+            pass
+
+    return digest.hexdigest()
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WaylandOutput:
     """Represents a wlr-randr output."""
 
@@ -21,7 +83,7 @@ class WaylandOutput:
     current_mode: Optional[str] = None  # e.g., "1920x1080@60Hz"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DDCDisplay:
     """Represents a ddcutil-detected display."""
 
@@ -32,13 +94,32 @@ class DDCDisplay:
     serial: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CorrelatedDisplay:
     """A display with both wlr-randr and ddcutil information."""
 
     wayland: WaylandOutput
     ddc: Optional[DDCDisplay] = None
 
+    # Derived names, computed once in __post_init__ (used on every publish)
+    _unique_id: str = field(init=False, repr=False, compare=False)
+    _display_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        wayland = self.wayland
+        # Prefer serial, fall back to model+output_name
+        if wayland.serial:
+            unique_id = wayland.serial
+        else:
+            unique_id = f"{wayland.model or wayland.name}_{wayland.name}"
+        object.__setattr__(self, "_unique_id", unique_id.lower().translate(_ID_TRANS))
+
+        if wayland.model:
+            display_name = f"{wayland.model} ({wayland.name})"
+        else:
+            display_name = wayland.name
+        object.__setattr__(self, "_display_name", display_name)
+
     @property
     def supports_brightness(self) -> bool:
         """Check if this display supports DDC brightness control."""
@@ -47,28 +128,124 @@ class CorrelatedDisplay:
     @property
     def unique_id(self) -> str:
         """Generate a stable unique ID for Home Assistant."""
-        # Prefer serial, fall back to model+output_name
-        if self.wayland.serial:
-            return self.wayland.serial.lower().replace(" ", "_").replace("-", "_")
-        base = self.wayland.model or self.wayland.name
-        return f"{base}_{self.wayland.name}".lower().replace(" ", "_").replace("-", "_")
+        return self._unique_id
 
     @property
     def display_name(self) -> str:
         """Human-readable display name."""
-        if self.wayland.model:
-            return f"{self.wayland.model} ({self.wayland.name})"
-        return self.wayland.name
+        return self._display_name
+
+
+def _decode(value: bytes) -> str:
+    return value.decode("utf-8", "replace")
+
+
+def _parse_text(value: bytes) -> str:
+    return _decode(value.strip())
+
+
+def _parse_enabled(value: bytes) -> bool:
+    return b"yes" in value.lower()
+
+
+def _parse_bus(value: bytes) -> Optional[int]:
+    # "/dev/i2c-7" -> 7
+    bus_match = _I2C_RE.search(value)
+    return int(bus_match.group(1)) if bus_match else None
+
+
+def _parse_mfg(value: bytes) -> Optional[str]:
+    # "SAM - Samsung Electric Company" -> "SAM"
+    mfg_match = _MFG_RE.match(value)
+    return _decode(mfg_match.group(1)) if mfg_match else None
+
+
+# "Key: value" lines we care about, by key: (field name, parser). A parser
+# returning None leaves the field unset.
+_FieldParsers = dict[bytes, tuple[str, Callable[[bytes], Any]]]
+
+_WLR_HANDLERS: _FieldParsers = {
+    b"Enabled": ("enabled", _parse_enabled),
+    b"Make": ("make", _parse_text),
+    b"Model": ("model", _parse_text),
+    b"Serial": ("serial", _parse_text),
+}
+
+_DDC_HANDLERS: _FieldParsers = {
+    b"I2C bus": ("i2c_bus", _parse_bus),
+    b"Mfg id": ("mfg_id", _parse_mfg),
+    b"Model": ("model", _parse_text),
+    b"Serial number": ("serial", _parse_text),
+}
+
+
+def _parse_field(handlers: _FieldParsers, fields: dict[str, Any], line: bytes) -> bool:
+    """Store a "Key: value" line's value in fields if handlers knows the key.
+
+    Returns:
+        True if the line was a known key
+    """
+    key, sep, value = line.partition(b":")
+    handler = handlers.get(key) if sep else None
+    if handler is None:
+        return False
+
+    name, parse = handler
+    parsed = parse(value)
+    if parsed is not None:
+        fields[name] = parsed
+    return True
 
 
 class DisplayManager:
     """Manages display detection and correlation."""
 
-    def __init__(self, display_overrides: Optional[list] = None):
-        """Initialize with optional manual display-to-DDC mappings."""
+    def __init__(
+        self,
+        display_overrides: Optional[list] = None,
+        cache_path: Optional[Path] = None,
+        use_library: bool = True,
+        outputs_ttl: float = 2.0,
+    ):
+        """Initialize display manager.
+
+        Args:
+            display_overrides: Optional manual display-to-DDC mappings
+            cache_path: Where to cache ddcutil detect results between runs,
+                or None to always run detection
+            use_library: Detect displays through libddcutil when it's
+                available instead of parsing ddcutil detect output
+            outputs_ttl: Seconds a wlr-randr result is reused before
+                running wlr-randr again
+        """
         self.display_overrides = {o.output_name: o for o in (display_overrides or [])}
+        self.cache_path = cache_path
+        self.use_library = use_library
+        self.outputs_ttl = outputs_ttl
+
+        # Last wlr-randr result: (time.monotonic() timestamp, outputs)
+        self._outputs_cache: Optional[tuple[float, list[WaylandOutput]]] = None
+        # Last correlation: (topology key, output name -> matched DDC display)
+        self._correlation: Optional[tuple[tuple, dict[str, Optional[DDCDisplay]]]] = None
+
+    async def discover_wayland_outputs(self, refresh: bool = False) -> list[WaylandOutput]:
+        """Get display info from wlr-randr, reusing a result younger than outputs_ttl.
+
+        Args:
+            refresh: Ignore the cached result and run wlr-randr again
+        """
+        now = time.monotonic()
+        if not refresh and self._outputs_cache is not None:
+            fetched_at, outputs = self._outputs_cache
+            if now - fetched_at < self.outputs_ttl:
+                return outputs
+
+        outputs = await self._run_wlr_randr()
+        # Don't cache failures, so the next call retries straight away
+        self._outputs_cache = (now, outputs) if outputs else None
+        return outputs
 
-    async def discover_wayland_outputs(self) -> list[WaylandOutput]:
+    async def _run_wlr_randr(self) -> list[WaylandOutput]:
         """Parse wlr-randr output to get display info."""
         try:
             proc = await asyncio.create_subprocess_exec(
@@ -82,7 +259,7 @@ class DisplayManager:
                 logger.error(f"wlr-randr failed: {stderr.decode()}")
                 return []
 
-            return self._parse_wlr_randr_output(stdout.decode())
+            return self._parse_wlr_randr_output(stdout)
         except FileNotFoundError:
             logger.error("wlr-randr not found. Is it installed?")
             return []
@@ -90,8 +267,10 @@ class DisplayManager:
             logger.exception(f"Error discovering Wayland outputs: {e}")
             return []
 
-    def _parse_wlr_randr_output(self, output: str) -> list[WaylandOutput]:
-        """Parse wlr-randr output text into WaylandOutput objects.
+    def _parse_wlr_randr_output(self, output: bytes) -> list[WaylandOutput]:
+        """Parse raw wlr-randr output into WaylandOutput objects.
+
+        Only the extracted values are decoded, not the whole output.
 
         Example wlr-randr output:
         HDMI-A-1 "Samsung Electric Company LU28R55 HNMNB00590 (HDMI-A-1)"
@@ -104,43 +283,76 @@ class DisplayManager:
             3840x2160@59.997002 Hz (preferred, current)
         """
         outputs = []
-        current_output: Optional[WaylandOutput] = None
+        # Fields of the output being parsed; the (frozen) WaylandOutput is
+        # built once its section ends
+        current: Optional[dict[str, Any]] = None
 
-        for line in output.split("\n"):
+        for line in output.splitlines():
             # New output starts with non-whitespace
-            if line and not line[0].isspace():
+            if line and not line[:1].isspace():
                 # Save previous output
-                if current_output:
-                    outputs.append(current_output)
+                if current is not None:
+                    outputs.append(WaylandOutput(**current))
 
                 # Parse output name (first word)
-                match = re.match(r"^(\S+)", line)
+                match = _OUTPUT_NAME_RE.match(line)
                 if match:
-                    current_output = WaylandOutput(name=match.group(1))
-            elif current_output and line.strip():
+                    current = {"name": _decode(match.group(1))}
+            elif current is not None and line.strip():
                 line = line.strip()
 
-                if line.startswith("Enabled:"):
-                    current_output.enabled = "yes" in line.lower()
-                elif line.startswith("Make:"):
-                    current_output.make = line.split(":", 1)[1].strip()
-                elif line.startswith("Model:"):
-                    current_output.model = line.split(":", 1)[1].strip()
-                elif line.startswith("Serial:"):
-                    current_output.serial = line.split(":", 1)[1].strip()
-                elif "current" in line.lower() and "x" in line:
+                if _parse_field(_WLR_HANDLERS, current, line):
+                    continue
+                if b"current" in line.lower() and b"x" in line:
                     # Parse mode line like "3840x2160@59.997002 Hz (preferred, current)"
-                    mode_match = re.match(r"(\d+x\d+@[\d.]+)\s*Hz", line)
+                    mode_match = _MODE_RE.match(line)
                     if mode_match:
-                        current_output.current_mode = mode_match.group(1) + "Hz"
+                        current["current_mode"] = _decode(mode_match.group(1)) + "Hz"
 
         # Don't forget the last output
-        if current_output:
-            outputs.append(current_output)
+        if current is not None:
+            outputs.append(WaylandOutput(**current))
 
         return outputs
 
     async def discover_ddc_displays(self) -> list[DDCDisplay]:
+        """Get DDC-capable displays from libddcutil or ddcutil detect."""
+        if self.use_library:
+            displays = await asyncio.to_thread(self._detect_with_library)
+            if displays is not None:
+                return displays
+        return await self._detect_with_cli()
+
+    @staticmethod
+    def _detect_with_library() -> Optional[list[DDCDisplay]]:
+        """Detect displays in-process via libddcutil (blocking).
+
+        Returns:
+            Detected displays, or None if the library is unavailable or
+            detection failed and the CLI should be tried instead
+        """
+        lib = load_libddcutil()
+        if lib is None:
+            return None
+
+        try:
+            detected = lib.detect()
+        except DDCAError as e:
+            logger.warning(f"libddcutil detection failed, using ddcutil CLI: {e}")
+            return None
+
+        return [
+            DDCDisplay(
+                display_number=dispno,
+                i2c_bus=i2c_bus,
+                mfg_id=mfg_id,
+                model=model,
+                serial=serial,
+            )
+            for dispno, i2c_bus, mfg_id, model, serial in detected
+        ]
+
+    async def _detect_with_cli(self) -> list[DDCDisplay]:
         """Parse ddcutil detect output to get DDC-capable displays."""
         try:
             proc = await asyncio.create_subprocess_exec(
@@ -156,7 +368,7 @@ class DisplayManager:
                 logger.warning(f"ddcutil detect returned {proc.returncode}")
                 return []
 
-            return self._parse_ddcutil_output(stdout.decode())
+            return self._parse_ddcutil_output(stdout)
         except FileNotFoundError:
             logger.error("ddcutil not found. Is it installed?")
             return []
@@ -164,8 +376,10 @@ class DisplayManager:
             logger.exception(f"Error discovering DDC displays: {e}")
             return []
 
-    def _parse_ddcutil_output(self, output: str) -> list[DDCDisplay]:
-        """Parse ddcutil detect output into DDCDisplay objects.
+    def _parse_ddcutil_output(self, output: bytes) -> list[DDCDisplay]:
+        """Parse raw ddcutil detect output into DDCDisplay objects.
+
+        Only the extracted values are decoded, not the whole output.
 
         Example ddcutil detect output:
         Display 1
@@ -177,98 +391,156 @@ class DisplayManager:
            ...
         """
         displays = []
-        current_display: Optional[DDCDisplay] = None
+        # Fields of the display being parsed; the (frozen) DDCDisplay is
+        # built once its section ends
+        current: Optional[dict[str, Any]] = None
 
-        for line in output.split("\n"):
+        for line in output.splitlines():
             line_stripped = line.strip()
 
             # New display starts with "Display N"
-            if line_stripped.startswith("Display "):
-                if current_display and current_display.i2c_bus is not None:
-                    displays.append(current_display)
+            if line_stripped.startswith(b"Display "):
+                if current is not None:
+                    displays.append(DDCDisplay(**current))
 
                 try:
                     display_num = int(line_stripped.split()[1])
-                    current_display = DDCDisplay(display_number=display_num, i2c_bus=-1)
+                    current = {"display_number": display_num, "i2c_bus": -1}
                 except (IndexError, ValueError):
-                    current_display = None
-            elif current_display:
-                if line_stripped.startswith("I2C bus:"):
-                    # Parse "/dev/i2c-7" -> 7
-                    bus_match = re.search(r"/dev/i2c-(\d+)", line_stripped)
-                    if bus_match:
-                        current_display.i2c_bus = int(bus_match.group(1))
-                elif line_stripped.startswith("Mfg id:"):
-                    # Parse "SAM - Samsung Electric Company" -> "SAM"
-                    mfg_match = re.match(r"Mfg id:\s*(\w+)", line_stripped)
-                    if mfg_match:
-                        current_display.mfg_id = mfg_match.group(1)
-                elif line_stripped.startswith("Model:"):
-                    current_display.model = line_stripped.split(":", 1)[1].strip()
-                elif line_stripped.startswith("Serial number:"):
-                    current_display.serial = line_stripped.split(":", 1)[1].strip()
+                    current = None
+            elif current is not None:
+                _parse_field(_DDC_HANDLERS, current, line_stripped)
 
         # Don't forget the last display
-        if current_display and current_display.i2c_bus >= 0:
-            displays.append(current_display)
+        if current is not None and current["i2c_bus"] >= 0:
+            displays.append(DDCDisplay(**current))
 
         return displays
 
-    async def correlate_displays(self) -> list[CorrelatedDisplay]:
-        """Match wlr-randr outputs to ddcutil displays via EDID data."""
-        wayland_outputs = await self.discover_wayland_outputs()
+    def _load_ddc_cache(self, fingerprint: str) -> Optional[list[DDCDisplay]]:
+        """Return cached DDC displays if the cache matches the fingerprint."""
+        assert self.cache_path is not None
+        data = cache.load_json(self.cache_path)
+        if not isinstance(data, dict):
+            return None
+        if data.get("version") != DDC_CACHE_VERSION or data.get("fingerprint") != fingerprint:
+            return None
+        try:
+            return [DDCDisplay(**d) for d in data["displays"]]
+        except (KeyError, TypeError) as e:
+            logger.debug(f"Ignoring malformed display cache: {e}")
+            return None
+
+    def _save_ddc_cache(self, fingerprint: str, displays: list[DDCDisplay]) -> None:
+        """Write DDC displays to the cache file."""
+        assert self.cache_path is not None
+        cache.write_json(
+            self.cache_path,
+            {
+                "version": DDC_CACHE_VERSION,
+                "fingerprint": fingerprint,
+                "displays": [asdict(d) for d in displays],
+            },
+        )
+
+    def invalidate_cache(self) -> None:
+        """Drop cached DDC detection results."""
+        if self.cache_path is not None:
+            cache.remove(self.cache_path)
+
+    async def _get_ddc_displays(self, refresh: bool = False) -> list[DDCDisplay]:
+        """Get DDC displays, from the cache when the monitors are unchanged."""
+        if self.cache_path is None:
+            return await self.discover_ddc_displays()
+
+        fingerprint = drm_fingerprint()
+        if fingerprint and not refresh:
+            cached = self._load_ddc_cache(fingerprint)
+            if cached is not None:
+                logger.debug(f"Using cached DDC detection from {self.cache_path}")
+                return cached
+
         ddc_displays = await self.discover_ddc_displays()
+        # Don't cache empty results - ddcutil may just be missing or failing
+        if fingerprint and ddc_displays:
+            self._save_ddc_cache(fingerprint, ddc_displays)
+        return ddc_displays
+
+    async def correlate_displays(self, refresh: bool = False) -> list[CorrelatedDisplay]:
+        """Match wlr-randr outputs to ddcutil displays via EDID data.
+
+        Args:
+            refresh: Ignore cached DDC detection results and probe again
+        """
+        # Both probes spawn a subprocess; ddcutil detect is by far the slower
+        wayland_outputs, ddc_displays = await asyncio.gather(
+            self.discover_wayland_outputs(), self._get_ddc_displays(refresh)
+        )
 
         logger.info(f"Found {len(wayland_outputs)} Wayland outputs, {len(ddc_displays)} DDC displays")
 
+        # Matching only depends on which monitors are where, so reuse the last
+        # result (with the fresh wlr-randr state) while that hasn't changed
+        topology = (
+            tuple((o.name, o.model, o.serial) for o in wayland_outputs),
+            tuple(astuple(d) for d in ddc_displays),
+        )
+        if self._correlation is not None and self._correlation[0] == topology:
+            matches = self._correlation[1]
+            return [
+                CorrelatedDisplay(wayland=output, ddc=matches[output.name])
+                for output in wayland_outputs
+            ]
+
+        # Index DDC displays by EDID field; lists keep detection order so
+        # duplicate models are matched in the same order as before
+        ddc_by_serial: dict[str, list[DDCDisplay]] = {}
+        ddc_by_model: dict[str, list[DDCDisplay]] = {}
+        ddc_by_bus: dict[int, DDCDisplay] = {}
+        for ddc in ddc_displays:
+            ddc_by_bus.setdefault(ddc.i2c_bus, ddc)
+            if ddc.serial:
+                ddc_by_serial.setdefault(ddc.serial, []).append(ddc)
+            if ddc.model:
+                ddc_by_model.setdefault(ddc.model, []).append(ddc)
+
         correlated = []
         used_ddc: set[int] = set()
 
+        def first_unused(candidates: list[DDCDisplay]) -> Optional[DDCDisplay]:
+            return next((d for d in candidates if d.display_number not in used_ddc), None)
+
         for output in wayland_outputs:
             matched_ddc: Optional[DDCDisplay] = None
 
             # Check for manual override first
-            if output.name in self.display_overrides:
-                override = self.display_overrides[output.name]
-                if override.ddc_bus is not None:
-                    for ddc in ddc_displays:
-                        if ddc.i2c_bus == override.ddc_bus:
-                            matched_ddc = ddc
-                            used_ddc.add(ddc.display_number)
-                            logger.info(f"Override: {output.name} -> i2c-{ddc.i2c_bus}")
-                            break
+            override = self.display_overrides.get(output.name)
+            if override is not None and override.ddc_bus is not None:
+                matched_ddc = ddc_by_bus.get(override.ddc_bus)
+                if matched_ddc:
+                    used_ddc.add(matched_ddc.display_number)
+                    logger.info(f"Override: {output.name} -> i2c-{matched_ddc.i2c_bus}")
 
             # Strategy 1: Exact serial number match
             if not matched_ddc and output.serial:
-                for ddc in ddc_displays:
-                    if (
-                        ddc.serial
-                        and ddc.serial == output.serial
-                        and ddc.display_number not in used_ddc
-                    ):
-                        matched_ddc = ddc
-                        used_ddc.add(ddc.display_number)
-                        logger.info(f"Serial match: {output.name} -> i2c-{ddc.i2c_bus}")
-                        break
+                matched_ddc = first_unused(ddc_by_serial.get(output.serial, []))
+                if matched_ddc:
+                    used_ddc.add(matched_ddc.display_number)
+                    logger.info(f"Serial match: {output.name} -> i2c-{matched_ddc.i2c_bus}")
 
             # Strategy 2: Model name match (fallback)
             if not matched_ddc and output.model:
-                for ddc in ddc_displays:
-                    if (
-                        ddc.model
-                        and ddc.model == output.model
-                        and ddc.display_number not in used_ddc
-                    ):
-                        matched_ddc = ddc
-                        used_ddc.add(ddc.display_number)
-                        logger.info(f"Model match: {output.name} -> i2c-{ddc.i2c_bus}")
-                        break
+                matched_ddc = first_unused(ddc_by_model.get(output.model, []))
+                if matched_ddc:
+                    used_ddc.add(matched_ddc.display_number)
+                    logger.info(f"Model match: {output.name} -> i2c-{matched_ddc.i2c_bus}")
 
             correlated.append(CorrelatedDisplay(wayland=output, ddc=matched_ddc))
 
             if not matched_ddc:
                 logger.warning(f"No DDC match for {output.name} - brightness control disabled")
 
+        self._correlation = (topology, {c.wayland.name: c.ddc for c in correlated})
         return correlated
 
     async def set_display_power(self, output_name: str, on: bool) -> bool:
@@ -287,13 +559,16 @@ class DisplayManager:
                 return False
 
             logger.info(f"Set {output_name} power: {'ON' if on else 'OFF'}")
+            self._outputs_cache = None
+            # Displays that were off may not have answered DDC detection
+            self.invalidate_cache()
             return True
         except Exception as e:
             logger.exception(f"Error setting display power: {e}")
             return False
 
     async def get_display_enabled(self, output_name: str) -> Optional[bool]:
-        """Get whether a specific display is enabled."""
+        """Get whether a specific display is enabled (from the outputs cache)."""
         outputs = await self.discover_wayland_outputs()
         for output in outputs:
             if output.name == output_name:
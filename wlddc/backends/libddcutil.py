@@ -0,0 +1,292 @@
+"""Minimal ctypes bindings for libddcutil.
+
+Only the handful of calls wlddc needs to read and write non-table VCP
+features are bound. All functions here block on I2C I/O, so async callers
+should run them in a worker thread.
+"""
+
+import ctypes
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+LIBDDCUTIL_SONAME = "libddcutil.so.5"
+
+# ddca_init() arguments: leave syslog alone, no special init behaviour
+_DDCA_SYSLOG_NOT_SET = -1
+_DDCA_INIT_OPTIONS_NONE = 0
+
+# DDCA_IO_Mode for displays on an I2C bus (as opposed to USB)
+_DDCA_IO_I2C = 0
+
+
+class DDCAError(Exception):
+    """A libddcutil call returned a non-zero status code."""
+
+    def __init__(self, func: str, status: int, name: str):
+        super().__init__(f"{func} failed: {name} ({status})")
+        self.status = status
+
+
+class _NonTableVcpValue(ctypes.Structure):
+    """DDCA_Non_Table_Vcp_Value: max and current value, high/low bytes."""
+
+    _fields_ = [
+        ("mh", ctypes.c_uint8),
+        ("ml", ctypes.c_uint8),
+        ("sh", ctypes.c_uint8),
+        ("sl", ctypes.c_uint8),
+    ]
+
+
+class _IOPath(ctypes.Structure):
+    """DDCA_IO_Path: I/O mode plus bus/device number."""
+
+    _fields_ = [
+        ("io_mode", ctypes.c_int),
+        ("path", ctypes.c_int),  # i2c_busno or hiddev_devno, depending on io_mode
+    ]
+
+
+class _MCCSVersionSpec(ctypes.Structure):
+    """DDCA_MCCS_Version_Spec."""
+
+    _fields_ = [("major", ctypes.c_uint8), ("minor", ctypes.c_uint8)]
+
+
+class _DisplayInfo(ctypes.Structure):
+    """DDCA_Display_Info: one entry of ddca_get_display_info_list2()."""
+
+    _fields_ = [
+        ("marker", ctypes.c_char * 4),
+        ("dispno", ctypes.c_int),
+        ("path", _IOPath),
+        ("usb_bus", ctypes.c_int),
+        ("usb_device", ctypes.c_int),
+        ("mfg_id", ctypes.c_char * 4),
+        ("model_name", ctypes.c_char * 14),
+        ("sn", ctypes.c_char * 14),
+        ("product_code", ctypes.c_uint16),
+        ("edid_bytes", ctypes.c_uint8 * 128),
+        ("vcp_version", _MCCSVersionSpec),
+        ("dref", ctypes.c_void_p),
+    ]
+
+
+class _DisplayInfoList(ctypes.Structure):
+    """DDCA_Display_Info_List: count plus a flexible array of entries."""
+
+    _fields_ = [
+        ("ct", ctypes.c_int),
+        ("info", _DisplayInfo * 0),
+    ]
+
+
+def _decode(field: bytes) -> Optional[str]:
+    """Decode a fixed-size, NUL-terminated EDID text field."""
+    text = field.decode(errors="replace").strip()
+    return text or None
+
+
+class LibDDCUtil:
+    """Thin wrapper around a loaded libddcutil shared library."""
+
+    def __init__(self, lib: ctypes.CDLL):
+        """Bind function prototypes on an already loaded library.
+
+        Args:
+            lib: Handle returned by ctypes.CDLL for libddcutil
+        """
+        self._lib = lib
+        status = ctypes.c_int
+        handle = ctypes.c_void_p
+
+        lib.ddca_init.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.c_int]
+        lib.ddca_init.restype = status
+        lib.ddca_rc_name.argtypes = [status]
+        lib.ddca_rc_name.restype = ctypes.c_char_p
+        lib.ddca_create_busno_display_identifier.argtypes = [
+            ctypes.c_int,
+            ctypes.POINTER(handle),
+        ]
+        lib.ddca_create_busno_display_identifier.restype = status
+        lib.ddca_free_display_identifier.argtypes = [handle]
+        lib.ddca_free_display_identifier.restype = status
+        lib.ddca_get_display_ref.argtypes = [handle, ctypes.POINTER(handle)]
+        lib.ddca_get_display_ref.restype = status
+        lib.ddca_open_display2.argtypes = [handle, ctypes.c_bool, ctypes.POINTER(handle)]
+        lib.ddca_open_display2.restype = status
+        lib.ddca_close_display.argtypes = [handle]
+        lib.ddca_close_display.restype = status
+        lib.ddca_get_non_table_vcp_value.argtypes = [
+            handle,
+            ctypes.c_uint8,
+            ctypes.POINTER(_NonTableVcpValue),
+        ]
+        lib.ddca_get_non_table_vcp_value.restype = status
+        lib.ddca_set_non_table_vcp_value.argtypes = [
+            handle,
+            ctypes.c_uint8,
+            ctypes.c_uint8,
+            ctypes.c_uint8,
+        ]
+        lib.ddca_set_non_table_vcp_value.restype = status
+        lib.ddca_get_display_info_list2.argtypes = [
+            ctypes.c_bool,
+            ctypes.POINTER(ctypes.POINTER(_DisplayInfoList)),
+        ]
+        lib.ddca_get_display_info_list2.restype = status
+        lib.ddca_free_display_info_list.argtypes = [ctypes.POINTER(_DisplayInfoList)]
+        lib.ddca_free_display_info_list.restype = None
+
+    def _check(self, func: str, rc: int) -> None:
+        """Raise DDCAError for a non-zero status code."""
+        if rc != 0:
+            name = self._lib.ddca_rc_name(rc)
+            raise DDCAError(func, rc, name.decode() if name else "unknown")
+
+    def init(self, libopts: Optional[str] = None) -> None:
+        """Initialize the library (config file, display detection settings).
+
+        Args:
+            libopts: Options applied on top of the config file, or None
+        """
+        self._check(
+            "ddca_init",
+            self._lib.ddca_init(
+                libopts.encode() if libopts else None,
+                _DDCA_SYSLOG_NOT_SET,
+                _DDCA_INIT_OPTIONS_NONE,
+            ),
+        )
+
+    def detect(
+        self,
+    ) -> list[tuple[int, int, Optional[str], Optional[str], Optional[str]]]:
+        """Detect valid DDC/CI displays on I2C buses.
+
+        Returns:
+            List of (display number, I2C bus, mfg id, model, serial) tuples
+        """
+        dlist = ctypes.POINTER(_DisplayInfoList)()
+        self._check(
+            "ddca_get_display_info_list2",
+            self._lib.ddca_get_display_info_list2(False, ctypes.byref(dlist)),
+        )
+        try:
+            # info is a C flexible array member; view it with its real length
+            infos = (_DisplayInfo * dlist.contents.ct).from_address(
+                ctypes.addressof(dlist.contents) + _DisplayInfoList.info.offset
+            )
+            return [
+                (
+                    info.dispno,
+                    info.path.path,
+                    _decode(info.mfg_id),
+                    _decode(info.model_name),
+                    _decode(info.sn),
+                )
+                for info in infos
+                if info.path.io_mode == _DDCA_IO_I2C
+            ]
+        finally:
+            self._lib.ddca_free_display_info_list(dlist)
+
+    def open_bus(self, i2c_bus: int) -> int:
+        """Open the display on an I2C bus.
+
+        Args:
+            i2c_bus: The I2C bus number (e.g., 7 for /dev/i2c-7)
+
+        Returns:
+            Opaque display handle, to be released with close()
+        """
+        did = ctypes.c_void_p()
+        self._check(
+            "ddca_create_busno_display_identifier",
+            self._lib.ddca_create_busno_display_identifier(i2c_bus, ctypes.byref(did)),
+        )
+        try:
+            dref = ctypes.c_void_p()
+            self._check(
+                "ddca_get_display_ref",
+                self._lib.ddca_get_display_ref(did, ctypes.byref(dref)),
+            )
+        finally:
+            self._lib.ddca_free_display_identifier(did)
+
+        dh = ctypes.c_void_p()
+        self._check(
+            "ddca_open_display2",
+            self._lib.ddca_open_display2(dref, True, ctypes.byref(dh)),
+        )
+        return dh.value
+
+    def close(self, handle: int) -> None:
+        """Close a display handle returned by open_bus()."""
+        self._check("ddca_close_display", self._lib.ddca_close_display(handle))
+
+    def get_vcp(self, handle: int, code: int) -> tuple[int, int]:
+        """Read a non-table VCP feature.
+
+        Returns:
+            Tuple of (current, max) values
+        """
+        val = _NonTableVcpValue()
+        self._check(
+            "ddca_get_non_table_vcp_value",
+            self._lib.ddca_get_non_table_vcp_value(handle, code, ctypes.byref(val)),
+        )
+        return (val.sh << 8 | val.sl, val.mh << 8 | val.ml)
+
+    def set_vcp(self, handle: int, code: int, value: int) -> None:
+        """Write a non-table VCP feature."""
+        self._check(
+            "ddca_set_non_table_vcp_value",
+            self._lib.ddca_set_non_table_vcp_value(
+                handle, code, (value >> 8) & 0xFF, value & 0xFF
+            ),
+        )
+
+
+_load_lock = threading.Lock()
+_loaded = False
+_library: Optional[LibDDCUtil] = None
+
+
+def load_libddcutil(libopts: Optional[str] = None) -> Optional[LibDDCUtil]:
+    """Load and initialize libddcutil once per process.
+
+    ddca_init() may only run once, so libopts only take effect on the first
+    call; later calls return the same (possibly None) result.
+
+    Args:
+        libopts: Library options, in the same syntax as the [libddcutil]
+            section of ddcutilrc (e.g. "--sleep-multiplier 0.1")
+
+    Returns:
+        The library wrapper, or None if it isn't installed or fails to
+        initialize (callers then fall back to the ddcutil CLI)
+    """
+    global _loaded, _library
+
+    with _load_lock:
+        if _loaded:
+            return _library
+        _loaded = True
+
+        try:
+            lib = LibDDCUtil(ctypes.CDLL(LIBDDCUTIL_SONAME))
+            lib.init(libopts)
+        except (OSError, AttributeError) as e:
+            logger.debug(f"libddcutil unavailable, using ddcutil CLI: {e}")
+            return None
+        except DDCAError as e:
+            logger.warning(f"libddcutil failed to initialize, using ddcutil CLI: {e}")
+            return None
+
+        logger.debug(f"Loaded {LIBDDCUTIL_SONAME}")
+        _library = lib
+        return lib
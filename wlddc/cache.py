@@ -0,0 +1,45 @@
+"""Small JSON cache files under the user's cache directory."""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def cache_dir() -> Path:
+    """Directory for wlddc cache files ($XDG_CACHE_HOME/wlddc)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "wlddc"
+
+
+def load_json(path: Path) -> Optional[Any]:
+    """Read a cache file, returning None if it's missing or unreadable."""
+    try:
+        return json.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.debug(f"Ignoring unreadable cache file {path}: {e}")
+        return None
+
+
+def write_json(path: Path, data: Any) -> None:
+    """Atomically write a cache file. Failures are logged and ignored."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Failed to write cache file {path}: {e}")
+
+
+def remove(path: Path) -> None:
+    """Delete a cache file if it exists."""
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as e:
+        logger.debug(f"Failed to remove cache file {path}: {e}")
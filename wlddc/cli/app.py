@@ -0,0 +1,263 @@
+"""Typer app for the full wlddc CLI.
+
+Only imported when the static fast path in ``wlddc.cli.commands`` can't
+handle a command line.
+"""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+import typer
+from typer.core import TyperGroup
+
+# Heavy modules (asyncio, backends, sub-apps) are imported inside the commands
+# that need them so short invocations don't pay for unrelated imports.
+
+
+class LazyGroup(TyperGroup):
+    """Root command group that only imports sub-apps when they are dispatched."""
+
+    lazy_subcommands = {
+        "generate": ("wlddc.cli.generate", "generate_app"),
+    }
+
+    def list_commands(self, ctx: typer.Context) -> list[str]:
+        commands = super().list_commands(ctx)
+        return commands + [name for name in self.lazy_subcommands if name not in commands]
+
+    def get_command(self, ctx: typer.Context, cmd_name: str):  # type: ignore[override]
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            import importlib
+
+            module_name, attr = self.lazy_subcommands[cmd_name]
+            sub_app = getattr(importlib.import_module(module_name), attr)
+            command = typer.main.get_command(sub_app)
+            command.name = cmd_name
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+app = typer.Typer(
+    name="wlddc",
+    help="Wayland monitor control MQTT agent for Home Assistant",
+    add_completion=True,
+    cls=LazyGroup,
+)
+
+
+def setup_logging(level: str) -> None:
+    """Configure logging."""
+    import logging
+
+    logging.basicConfig(
+        level=getattr(logging, level.upper(), logging.INFO),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+
+
+def version_callback(value: bool) -> None:
+    """Print version and exit."""
+    if value:
+        from wlddc import __version__
+
+        typer.echo(f"wlddc {__version__}")
+        raise typer.Exit()
+
+
+@app.callback()
+def main(
+    version: Optional[bool] = typer.Option(
+        None,
+        "--version",
+        "-V",
+        callback=version_callback,
+        is_eager=True,
+        help="Show version and exit",
+    ),
+) -> None:
+    """Wayland monitor control MQTT agent for Home Assistant."""
+    pass
+
+
+@app.command()
+def run(
+    config: Optional[Path] = typer.Option(
+        None,
+        "--config",
+        "-c",
+        help="Path to YAML config file",
+        exists=True,
+        dir_okay=False,
+    ),
+    broker: Optional[str] = typer.Option(
+        None,
+        "--broker",
+        "-b",
+        help="MQTT broker hostname (overrides config)",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Enable debug logging",
+    ),
+    force_rediscovery: bool = typer.Option(
+        False,
+        "--force-rediscovery",
+        help="Republish all Home Assistant discovery configs on startup",
+    ),
+) -> None:
+    """Run the MQTT agent."""
+    from wlddc.agent import Agent
+    from wlddc.cli.commands import run_async
+    from wlddc.config import Settings
+
+    settings = Settings.load(config)
+
+    # CLI overrides (the settings models are immutable, so copy with updates)
+    if broker:
+        settings = settings.model_copy(
+            update={"mqtt": settings.mqtt.model_copy(update={"broker": broker})}
+        )
+
+    if verbose:
+        settings = settings.model_copy(
+            update={"agent": settings.agent.model_copy(update={"log_level": "DEBUG"})}
+        )
+
+    setup_logging(settings.agent.log_level)
+
+    agent = Agent(settings, force_rediscovery=force_rediscovery)
+
+    try:
+        run_async(agent.run())
+
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command("set")
+def set_brightness(
+    value: str = typer.Argument(
+        ...,
+        help="Brightness value (0-100 or 0%-100%)",
+    ),
+    display: Optional[str] = typer.Option(
+        None,
+        "--display",
+        "-d",
+        help="Target specific display (output name or unique ID)",
+    ),
+) -> None:
+    """Set display brightness.
+
+    Examples:
+        wlddc set 50
+        wlddc set 75%
+        wlddc set 30 --display HDMI-A-1
+    """
+    from wlddc.cli.commands import cmd_set
+
+    raise typer.Exit(cmd_set(value, display))
+
+
+@app.command()
+def on(
+    display: Optional[str] = typer.Option(
+        None,
+        "--display",
+        "-d",
+        help="Target specific display (output name or unique ID)",
+    ),
+) -> None:
+    """Turn display(s) on.
+
+    Examples:
+        wlddc on
+        wlddc on --display HDMI-A-1
+    """
+    from wlddc.cli.commands import cmd_on
+
+    raise typer.Exit(cmd_on(display))
+
+
+@app.command()
+def off(
+    display: Optional[str] = typer.Option(
+        None,
+        "--display",
+        "-d",
+        help="Target specific display (output name or unique ID)",
+    ),
+) -> None:
+    """Turn display(s) off.
+
+    Examples:
+        wlddc off
+        wlddc off --display HDMI-A-1
+    """
+    from wlddc.cli.commands import cmd_off
+
+    raise typer.Exit(cmd_off(display))
+
+
+@app.command("list")
+def list_displays() -> None:
+    """List connected displays."""
+    from wlddc.cli.commands import cmd_list
+
+    raise typer.Exit(cmd_list())
+
+
+@app.command()
+def detect() -> None:
+    """Detect displays and show detailed correlation info."""
+    from wlddc.backends.display import DisplayManager, default_cache_path
+    from wlddc.cli.commands import run_async
+
+    async def _detect() -> None:
+        # Always probe fresh, but refresh the cache used by the other commands
+        manager = DisplayManager(cache_path=default_cache_path())
+        displays = await manager.correlate_displays(refresh=True)
+
+        if not displays:
+            typer.echo("No displays found.")
+            typer.echo("\nTroubleshooting:")
+            typer.echo("  - Ensure wlr-randr is installed")
+            typer.echo("  - Ensure you're running under a Wayland compositor")
+            typer.echo("  - Check WAYLAND_DISPLAY environment variable")
+            raise typer.Exit(1)
+
+        typer.echo(f"\nFound {len(displays)} display(s):\n")
+
+        for d in displays:
+            typer.echo(f"{d.wayland.name}:")
+            typer.echo(f"  Make:    {d.wayland.make or 'Unknown'}")
+            typer.echo(f"  Model:   {d.wayland.model or 'Unknown'}")
+            typer.echo(f"  Serial:  {d.wayland.serial or 'Unknown'}")
+            typer.echo(f"  Enabled: {d.wayland.enabled}")
+            typer.echo(f"  Mode:    {d.wayland.current_mode or 'Unknown'}")
+
+            if d.ddc:
+                typer.echo(f"  DDC Bus: /dev/i2c-{d.ddc.i2c_bus}")
+                typer.echo("  Brightness: supported")
+            else:
+                typer.echo("  DDC Bus: Not found")
+                typer.echo("  Brightness: NOT supported (no DDC)")
+
+            typer.echo(f"  Unique ID: {d.unique_id}")
+            typer.echo()
+
+        typer.echo("Use these unique IDs in your Home Assistant configuration.")
+
+    run_async(_detect())
+
+
+@app.command(hidden=True)
+def help(ctx: typer.Context) -> None:
+    """Show help message."""
+    assert ctx.parent is not None
+    typer.echo(ctx.parent.get_help())
+
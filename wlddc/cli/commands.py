@@ -0,0 +1,256 @@
+"""Typer-free implementations of the common CLI commands.
+
+These back the Typer commands in ``wlddc.cli.app`` and a static argv
+dispatcher for the hot entry path, so ``wlddc on``/``off``/``list``/``set``
+and ``--version`` never import typer or build the Click command tree.
+"""
+
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from wlddc.backends.display import CorrelatedDisplay
+
+T = TypeVar("T")
+
+
+def run_async(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on uvloop if it's installed, else the default loop."""
+    import asyncio
+
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(main)
+
+
+def _echo(message: str = "", err: bool = False) -> None:
+    """Print a line to stdout (or stderr)."""
+    print(message, file=sys.stderr if err else sys.stdout)
+
+
+def _select_targets(
+    displays: list["CorrelatedDisplay"],
+    name_or_id: Optional[str],
+    predicate: Optional[Callable[["CorrelatedDisplay"], bool]] = None,
+) -> list["CorrelatedDisplay"]:
+    """Pick the displays a command applies to.
+
+    Args:
+        displays: All correlated displays
+        name_or_id: Output name or unique ID of a single display, or None
+            for all displays
+        predicate: When targeting all displays, only keep those matching it
+    """
+    if name_or_id is None:
+        if predicate is None:
+            return list(displays)
+        return [d for d in displays if predicate(d)]
+
+    by_name = {d.wayland.name: d for d in displays}
+    by_uid = {d.unique_id: d for d in displays}
+    target = by_name.get(name_or_id) or by_uid.get(name_or_id)
+    return [target] if target is not None else []
+
+
+def cmd_set(value: str, display: Optional[str] = None) -> int:
+    """Set display brightness. Returns the process exit code."""
+    # Parse value (strip % if present)
+    try:
+        brightness = int(value.rstrip("%"))
+    except ValueError:
+        _echo(f"Error: Invalid brightness value: {value}", err=True)
+        return 1
+
+    if not 0 <= brightness <= 100:
+        _echo("Error: Brightness must be between 0 and 100", err=True)
+        return 1
+
+    return run_async(_set_brightness(brightness, display))
+
+
+async def _set_brightness(brightness: int, display: Optional[str]) -> int:
+    from wlddc.backends.brightness import BrightnessController
+    from wlddc.backends.display import DisplayManager, default_cache_path
+
+    manager = DisplayManager(cache_path=default_cache_path())
+    controller = BrightnessController()
+    # Load libddcutil with the controller's options before detection uses it
+    await controller.start()
+    displays = await manager.correlate_displays()
+
+    if not displays:
+        _echo("No displays found.", err=True)
+        return 1
+
+    # Without --display, target all displays with DDC support
+    targets = _select_targets(displays, display, lambda d: d.supports_brightness)
+
+    if not targets:
+        if display:
+            _echo(f"Display not found: {display}", err=True)
+        else:
+            _echo("No displays with brightness control found.", err=True)
+        return 1
+
+    await controller.start(d.ddc.i2c_bus for d in targets if d.supports_brightness and d.ddc)
+    try:
+        for d in targets:
+            if not d.supports_brightness or not d.ddc:
+                _echo(f"{d.wayland.name}: No DDC support, skipping")
+                continue
+
+            success = await controller.set_brightness(d.ddc.i2c_bus, brightness)
+            if success:
+                _echo(f"{d.wayland.name}: Set brightness to {brightness}%")
+            else:
+                _echo(f"{d.wayland.name}: Failed to set brightness", err=True)
+    finally:
+        await controller.aclose()
+
+    return 0
+
+
+def cmd_on(display: Optional[str] = None) -> int:
+    """Turn display(s) on. Returns the process exit code."""
+    return run_async(_set_power(display, on=True))
+
+
+def cmd_off(display: Optional[str] = None) -> int:
+    """Turn display(s) off. Returns the process exit code."""
+    return run_async(_set_power(display, on=False))
+
+
+async def _set_power(display: Optional[str], on: bool) -> int:
+    from wlddc.backends.display import DisplayManager, default_cache_path
+
+    manager = DisplayManager(cache_path=default_cache_path())
+    displays = await manager.correlate_displays()
+
+    if not displays:
+        _echo("No displays found.", err=True)
+        return 1
+
+    targets = _select_targets(displays, display)
+
+    if not targets:
+        _echo(f"Display not found: {display}", err=True)
+        return 1
+
+    action = "on" if on else "off"
+    for d in targets:
+        success = await manager.set_display_power(d.wayland.name, on=on)
+        if success:
+            _echo(f"{d.wayland.name}: Turned {action}")
+        else:
+            _echo(f"{d.wayland.name}: Failed to turn {action}", err=True)
+
+    return 0
+
+
+def cmd_list() -> int:
+    """List connected displays. Returns the process exit code."""
+    return run_async(_list())
+
+
+async def _list() -> int:
+    from wlddc.backends.display import DisplayManager, default_cache_path
+
+    manager = DisplayManager(cache_path=default_cache_path())
+    displays = await manager.correlate_displays()
+
+    if not displays:
+        _echo("No displays found.", err=True)
+        return 1
+
+    for d in displays:
+        status = "on" if d.wayland.enabled else "off"
+        brightness = "ddc" if d.supports_brightness else "no-ddc"
+        name = d.wayland.model or d.wayland.name
+        _echo(f"{d.wayland.name}  {status}  {brightness}  {name}")
+
+    return 0
+
+
+# Static command table for the fast path: (name, handler, positional args,
+# accepts --display). Anything not described here goes through Typer.
+_COMMANDS: tuple[tuple[str, Callable[..., int], int, bool], ...] = (
+    ("on", cmd_on, 0, True),
+    ("off", cmd_off, 0, True),
+    ("set", cmd_set, 1, True),
+    ("list", cmd_list, 0, False),
+)
+_COMMANDS_BY_NAME = {command[0]: command for command in _COMMANDS}
+
+_VERSION_FLAGS = ("--version", "-V")
+_DISPLAY_FLAGS = ("--display", "-d")
+
+
+def _parse_args(
+    args: list[str], accepts_display: bool
+) -> Optional[tuple[list[str], Optional[str]]]:
+    """Split args into positionals and an optional --display value.
+
+    Returns None for anything the fast path doesn't understand.
+    """
+    positionals: list[str] = []
+    display: Optional[str] = None
+
+    it = iter(args)
+    for arg in it:
+        if accepts_display and arg in _DISPLAY_FLAGS:
+            display = next(it, None)
+            if display is None:
+                return None
+        elif accepts_display and arg.startswith("--display="):
+            display = arg.partition("=")[2]
+        elif arg.startswith("-"):
+            return None
+        else:
+            positionals.append(arg)
+
+    return positionals, display
+
+
+def dispatch(argv: list[str]) -> Optional[int]:
+    """Run a command line through the static fast path.
+
+    Returns the exit code, or None if argv should be handled by the full
+    Typer app (help, less common commands, or unrecognized options).
+    """
+    if not argv:
+        return None
+
+    if len(argv) == 1 and argv[0] in _VERSION_FLAGS:
+        from wlddc import __version__
+
+        _echo(f"wlddc {__version__}")
+        return 0
+
+    command = _COMMANDS_BY_NAME.get(argv[0])
+    if command is None:
+        return None
+
+    _, handler, nargs, accepts_display = command
+    parsed = _parse_args(argv[1:], accepts_display)
+    if parsed is None or len(parsed[0]) != nargs:
+        return None
+
+    positionals, display = parsed
+    if accepts_display:
+        return handler(*positionals, display=display)
+    return handler(*positionals)
+
+
+def main() -> None:
+    """Console script entry point."""
+    exit_code = dispatch(sys.argv[1:])
+    if exit_code is None:
+        from wlddc.cli.app import app
+
+        app()
+    else:
+        sys.exit(exit_code)
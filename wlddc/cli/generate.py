@@ -3,14 +3,130 @@
 import os
 import socket
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import typer
 
-generate_app = typer.Typer(help="Generate configuration and service files")
+generate_app = typer.Typer(
+    help="Generate configuration and service files",
+    add_completion=False,
+)
 
 
+# Templates are filled with str.format_map(); literal braces are doubled
+_UNIT_TMPL = """\
+[Unit]
+Description=Wayland Monitor Control MQTT Agent
+After=network-online.target graphical-session.target
+Wants=network-online.target
+PartOf=graphical-session.target
+
+[Service]
+Type=simple
+ExecStart={python_path} -m wlddc run{config_arg}
+Restart=on-failure
+RestartSec=10
+
+# Wayland environment
+Environment=WAYLAND_DISPLAY={wayland_display}
+Environment=XDG_RUNTIME_DIR={xdg_runtime}
+
+# Security hardening (optional, comment out if causing issues)
+NoNewPrivileges=true
+ProtectSystem=strict
+ProtectHome=read-only
+PrivateTmp=true
+
+[Install]
+WantedBy=default.target
+"""
+
+_ECOSYSTEM_TMPL = """\
+module.exports = {{
+  apps: [{{
+    name: 'wlddc',
+    script: '{python_path}',
+    args: '-m wlddc run{config_arg}',
+    interpreter: 'none',
+    env: {{
+      WAYLAND_DISPLAY: '{wayland_display}',
+      XDG_RUNTIME_DIR: '{xdg_runtime}',
+    }},
+    // Restart configuration
+    restart_delay: 5000,
+    max_restarts: 10,
+    min_uptime: 10000,
+    // Logging
+    error_file: '~/.pm2/logs/wlddc-error.log',
+    out_file: '~/.pm2/logs/wlddc-out.log',
+    merge_logs: true,
+    time: true,
+  }}],
+}};
+"""
+
+_ENV_TMPL = """\
+# wlddc environment configuration
+# Copy to .env and customize values
+# Environment variables override config file values
+
+# MQTT Settings
+WLDDC_MQTT__BROKER=homeassistant.local
+WLDDC_MQTT__PORT=1883
+WLDDC_MQTT__USERNAME=mqtt-user
+WLDDC_MQTT__PASSWORD=your-password-here
+WLDDC_MQTT__CLIENT_ID=wlddc
+
+# Home Assistant Settings
+WLDDC_HOMEASSISTANT__DISCOVERY_PREFIX=homeassistant
+WLDDC_HOMEASSISTANT__DEVICE_ID={device_id}
+WLDDC_HOMEASSISTANT__DEVICE_NAME={device_name}
+
+# Agent Settings
+WLDDC_AGENT__POLL_INTERVAL=30
+WLDDC_AGENT__LOG_LEVEL=INFO
+"""
+
+_CONFIG_TMPL = """\
+# wlddc configuration
+# Save to ~/.config/wlddc/config.yaml or use --config flag
+
+mqtt:
+  broker: homeassistant.local
+  port: 1883
+  username: mqtt-user
+  password: your-password-here
+  client_id: wlddc
+  keepalive: 60
+  reconnect_interval: 5.0
+  reconnect_max_interval: 120.0
+
+homeassistant:
+  discovery_prefix: homeassistant
+  device_id: {device_id}
+  device_name: "{device_name}"
+
+agent:
+  poll_interval: 30
+  command_timeout: 10.0
+  ddcutil_retries: 2
+  log_level: INFO
+
+# Optional: Manual display-to-DDC bus mappings
+# Use this if auto-detection fails to correlate displays correctly
+# Run 'wlddc detect' to see available displays and their info
+#
+# display_overrides:
+#   - output_name: HDMI-A-1
+#     ddc_bus: 7
+#     brightness_enabled: true
+#     power_enabled: true
+"""
+
+
+@lru_cache(maxsize=1)
 def _get_device_defaults() -> tuple[str, str]:
     """Get default device_id and device_name based on hostname."""
     hostname = socket.gethostname().split(".")[0]  # Remove domain if present
@@ -19,6 +135,7 @@ def _get_device_defaults() -> tuple[str, str]:
     return device_id, device_name
 
 
+@lru_cache(maxsize=1)
 def _get_wayland_env() -> tuple[str, str]:
     """Get current Wayland environment variables."""
     wayland_display = os.environ.get("WAYLAND_DISPLAY", "wayland-1")
@@ -26,6 +143,23 @@ def _get_wayland_env() -> tuple[str, str]:
     return wayland_display, xdg_runtime_dir
 
 
+def _service_context(config_path: Optional[Path], wayland_display: Optional[str]) -> dict[str, str]:
+    """Placeholder values for the systemd and PM2 templates."""
+    wayland_env, xdg_runtime = _get_wayland_env()
+    return {
+        "python_path": sys.executable,
+        "config_arg": f" --config {config_path}" if config_path else "",
+        "wayland_display": wayland_display if wayland_display is not None else wayland_env,
+        "xdg_runtime": xdg_runtime,
+    }
+
+
+def _device_context() -> dict[str, str]:
+    """Placeholder values for the env and config templates."""
+    device_id, device_name = _get_device_defaults()
+    return {"device_id": device_id, "device_name": device_name}
+
+
 @generate_app.command("systemd")
 def generate_systemd(
     output: Optional[Path] = typer.Option(
@@ -55,40 +189,7 @@ def generate_systemd(
         systemctl --user daemon-reload
         systemctl --user enable --now wlddc
     """
-    python_path = sys.executable
-    wayland_env, xdg_runtime = _get_wayland_env()
-
-    if wayland_display is None:
-        wayland_display = wayland_env
-
-    config_arg = f" --config {config_path}" if config_path else ""
-
-    unit = f"""\
-[Unit]
-Description=Wayland Monitor Control MQTT Agent
-After=network-online.target graphical-session.target
-Wants=network-online.target
-PartOf=graphical-session.target
-
-[Service]
-Type=simple
-ExecStart={python_path} -m wlddc run{config_arg}
-Restart=on-failure
-RestartSec=10
-
-# Wayland environment
-Environment=WAYLAND_DISPLAY={wayland_display}
-Environment=XDG_RUNTIME_DIR={xdg_runtime}
-
-# Security hardening (optional, comment out if causing issues)
-NoNewPrivileges=true
-ProtectSystem=strict
-ProtectHome=read-only
-PrivateTmp=true
-
-[Install]
-WantedBy=default.target
-"""
+    unit = _UNIT_TMPL.format_map(_service_context(config_path, wayland_display))
 
     if output:
         output.write_text(unit)
@@ -134,37 +235,7 @@ def generate_pm2(
         pm2 save
         pm2 startup
     """
-    python_path = sys.executable
-    wayland_env, xdg_runtime = _get_wayland_env()
-
-    if wayland_display is None:
-        wayland_display = wayland_env
-
-    config_arg = f" --config {config_path}" if config_path else ""
-
-    ecosystem = f"""\
-module.exports = {{
-  apps: [{{
-    name: 'wlddc',
-    script: '{python_path}',
-    args: '-m wlddc run{config_arg}',
-    interpreter: 'none',
-    env: {{
-      WAYLAND_DISPLAY: '{wayland_display}',
-      XDG_RUNTIME_DIR: '{xdg_runtime}',
-    }},
-    // Restart configuration
-    restart_delay: 5000,
-    max_restarts: 10,
-    min_uptime: 10000,
-    // Logging
-    error_file: '~/.pm2/logs/wlddc-error.log',
-    out_file: '~/.pm2/logs/wlddc-out.log',
-    merge_logs: true,
-    time: true,
-  }}],
-}};
-"""
+    ecosystem = _ECOSYSTEM_TMPL.format_map(_service_context(config_path, wayland_display))
 
     if output:
         output.write_text(ecosystem)
@@ -197,29 +268,7 @@ def generate_env(
     Environment variables can be used instead of or alongside a YAML config file.
     Environment variables take precedence over config file values.
     """
-    device_id, device_name = _get_device_defaults()
-
-    env_content = f"""\
-# wlddc environment configuration
-# Copy to .env and customize values
-# Environment variables override config file values
-
-# MQTT Settings
-WLDDC_MQTT__BROKER=homeassistant.local
-WLDDC_MQTT__PORT=1883
-WLDDC_MQTT__USERNAME=mqtt-user
-WLDDC_MQTT__PASSWORD=your-password-here
-WLDDC_MQTT__CLIENT_ID=wlddc
-
-# Home Assistant Settings
-WLDDC_HOMEASSISTANT__DISCOVERY_PREFIX=homeassistant
-WLDDC_HOMEASSISTANT__DEVICE_ID={device_id}
-WLDDC_HOMEASSISTANT__DEVICE_NAME={device_name}
-
-# Agent Settings
-WLDDC_AGENT__POLL_INTERVAL=30
-WLDDC_AGENT__LOG_LEVEL=INFO
-"""
+    env_content = _ENV_TMPL.format_map(_device_context())
 
     if output:
         output.write_text(env_content)
@@ -242,43 +291,7 @@ def generate_config(
     Example usage:
         wlddc generate config > ~/.config/wlddc/config.yaml
     """
-    device_id, device_name = _get_device_defaults()
-
-    config_content = f"""\
-# wlddc configuration
-# Save to ~/.config/wlddc/config.yaml or use --config flag
-
-mqtt:
-  broker: homeassistant.local
-  port: 1883
-  username: mqtt-user
-  password: your-password-here
-  client_id: wlddc
-  keepalive: 60
-  reconnect_interval: 5.0
-  reconnect_max_interval: 120.0
-
-homeassistant:
-  discovery_prefix: homeassistant
-  device_id: {device_id}
-  device_name: "{device_name}"
-
-agent:
-  poll_interval: 30
-  command_timeout: 10.0
-  ddcutil_retries: 2
-  log_level: INFO
-
-# Optional: Manual display-to-DDC bus mappings
-# Use this if auto-detection fails to correlate displays correctly
-# Run 'wlddc detect' to see available displays and their info
-#
-# display_overrides:
-#   - output_name: HDMI-A-1
-#     ddc_bus: 7
-#     brightness_enabled: true
-#     power_enabled: true
-"""
+    config_content = _CONFIG_TMPL.format_map(_device_context())
 
     if output:
         output.parent.mkdir(parents=True, exist_ok=True)
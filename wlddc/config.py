@@ -1,16 +1,42 @@
 """Configuration management using pydantic-settings."""
 
+import os
 from pathlib import Path
 from typing import Optional
 
-import yaml
-from pydantic import BaseModel, Field, SecretStr
+from pydantic import BaseModel, ConfigDict, Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+def _read_yaml(path: Path) -> dict:
+    """Parse a YAML config file, returning {} if it's empty.
+
+    PyYAML is imported here rather than at module level, so env-only
+    configurations never load it.
+    """
+    import yaml
+
+    # PyYAML's libyaml-backed loader is much faster, but only exists when
+    # PyYAML was built against libyaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path) as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+# Config files tried, in order, when no (existing) path is given
+_DEFAULT_PATHS = (
+    Path.home() / ".config" / "wlddc" / "config.yaml",
+    Path.home() / ".config" / "wlddc" / "config.yml",
+    Path("config.yaml"),
+    Path("config.yml"),
+)
+
+
 class MQTTSettings(BaseModel):
     """MQTT broker connection settings."""
 
+    model_config = ConfigDict(frozen=True)
+
     broker: str = Field(default="localhost", description="MQTT broker hostname")
     port: int = Field(default=1883, ge=1, le=65535)
     username: Optional[str] = None
@@ -24,6 +50,8 @@ class MQTTSettings(BaseModel):
 class HomeAssistantSettings(BaseModel):
     """Home Assistant integration settings."""
 
+    model_config = ConfigDict(frozen=True)
+
     discovery_prefix: str = Field(default="homeassistant")
     device_id: str = Field(default="wlddc")
     device_name: str = Field(default="Wayland Monitor Controller")
@@ -32,15 +60,33 @@ class HomeAssistantSettings(BaseModel):
 class AgentSettings(BaseModel):
     """Agent behavior settings."""
 
+    model_config = ConfigDict(frozen=True)
+
     poll_interval: float = Field(default=30.0, ge=5.0, le=300.0)
     command_timeout: float = Field(default=10.0, ge=1.0, le=60.0)
     ddcutil_retries: int = Field(default=2, ge=0, le=5)
+    # Talk to displays through libddcutil in-process instead of the CLI
+    use_libddcutil: bool = True
+    # ddcutil tuning: scale DDC/CI waits (1.0 is ddcutil's default), skip the
+    # per-call capability check, and optionally force dynamic sleep on/off
+    ddcutil_sleep_multiplier: float = Field(default=0.1, gt=0.0, le=10.0)
+    ddcutil_skip_ddc_checks: bool = True
+    ddcutil_dynamic_sleep: Optional[bool] = None
+    # Coalesce brightness commands per display arriving within this window
+    brightness_debounce_ms: int = Field(default=200, ge=0, le=5000)
+    # Reuse a read/written brightness value for this long before asking DDC
+    brightness_cache_ttl: float = Field(default=5.0, ge=0.0, le=300.0)
     log_level: str = Field(default="INFO")
+    # Only read brightness over DDC after a command or every max_stale_interval
+    adaptive_polling: bool = False
+    max_stale_interval: float = Field(default=150.0, ge=5.0, le=3600.0)
 
 
 class DisplayOverride(BaseModel):
     """Manual display-to-DDC mapping override."""
 
+    model_config = ConfigDict(frozen=True)
+
     output_name: str  # e.g., "HDMI-A-1"
     ddc_bus: Optional[int] = None  # e.g., 7 for /dev/i2c-7
     brightness_enabled: bool = True
@@ -54,6 +100,7 @@ class Settings(BaseSettings):
         env_prefix="WLDDC_",
         env_nested_delimiter="__",
         extra="ignore",
+        frozen=True,
     )
 
     mqtt: MQTTSettings = Field(default_factory=MQTTSettings)
@@ -65,27 +112,23 @@ class Settings(BaseSettings):
     def load(cls, config_path: Optional[Path] = None) -> "Settings":
         """Load settings from env vars and optional YAML file.
 
-        Priority: Environment variables override YAML file values.
+        Priority: Environment variables override YAML file values. Settings
+        built from a file are cached until that file's mtime changes.
         """
-        yaml_data: dict = {}
-
-        # Try to load from YAML file
-        if config_path and config_path.exists():
-            with open(config_path) as f:
-                yaml_data = yaml.safe_load(f) or {}
-        else:
-            # Check default locations
-            default_paths = [
-                Path.home() / ".config" / "wlddc" / "config.yaml",
-                Path.home() / ".config" / "wlddc" / "config.yml",
-                Path("config.yaml"),
-                Path("config.yml"),
-            ]
-            for path in default_paths:
-                if path.exists():
-                    with open(path) as f:
-                        yaml_data = yaml.safe_load(f) or {}
-                    break
+        # Try the given file first, then the default locations
+        if config_path is None or not config_path.exists():
+            config_path = next((p for p in _DEFAULT_PATHS if p.exists()), None)
+
+        if config_path is None:
+            # No file to read - pydantic-settings overlays env vars itself
+            return cls()
+
+        key = (str(config_path.resolve()), os.stat(config_path).st_mtime_ns)
+        cached = _SETTINGS_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        yaml_data = _read_yaml(config_path)
 
         # Build nested settings from YAML
         mqtt_data = yaml_data.get("mqtt", {})
@@ -94,9 +137,15 @@ class Settings(BaseSettings):
         overrides_data = yaml_data.get("display_overrides", [])
 
         # Create settings - pydantic-settings will overlay env vars automatically
-        return cls(
+        settings = cls(
             mqtt=MQTTSettings(**mqtt_data),
             homeassistant=HomeAssistantSettings(**ha_data),
             agent=AgentSettings(**agent_data),
             display_overrides=[DisplayOverride(**o) for o in overrides_data],
         )
+        _SETTINGS_CACHE[key] = settings
+        return settings
+
+
+# Parsed config files by (resolved path, mtime_ns)
+_SETTINGS_CACHE: dict[tuple[str, int], Settings] = {}